@@ -0,0 +1,114 @@
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Each slot is a dict used as an insertion-ordered set, so membership, insert
+# and removal are O(1) and schedules still list employees in the order they
+# were placed. Every employee also has a bitmask of the days they work;
+# place() refuses a second shift on a day or a day past the weekly cap, so a
+# conflicting schedule can never be built.
+class AssignmentStore:
+    
+    def __init__(self, days: List[str], shifts: List[str], max_days: int):
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.max_days = max_days
+        self.day_bits = {day: 1 << i for i, day in enumerate(self.days)}
+        self.slots: Dict[str, Dict[str, Dict[str, None]]] = {
+            day: {shift: {} for shift in self.shifts} for day in self.days
+        }
+        self.day_mask: Dict[str, int] = defaultdict(int)
+        self.days_worked: Dict[str, int] = defaultdict(int)
+        self.assigned_shift: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self.size = 0
+    
+    def works(self, employee: str, day: str) -> bool:
+        return bool(self.day_mask.get(employee, 0) & self.day_bits[day])
+    
+    def can_place(self, employee: str, day: str) -> bool:
+        return (not self.day_mask.get(employee, 0) & self.day_bits[day]
+                and self.days_worked.get(employee, 0) < self.max_days)
+    
+    def place(self, employee: str, day: str, shift: str) -> bool:
+        mask = self.day_mask.get(employee, 0)
+        bit = self.day_bits[day]
+        worked = self.days_worked.get(employee, 0)
+        if mask & bit or worked >= self.max_days:
+            return False
+        self.slots[day][shift][employee] = None
+        self.day_mask[employee] = mask | bit
+        self.days_worked[employee] = worked + 1
+        self.assigned_shift[employee][day] = shift
+        self.size += 1
+        return True
+    
+    def unplace(self, employee: str, day: str) -> Optional[str]:
+        shifts = self.assigned_shift.get(employee)
+        shift = shifts.pop(day, None) if shifts else None
+        if shift is None:
+            return None
+        del self.slots[day][shift][employee]
+        self.day_mask[employee] &= ~self.day_bits[day]
+        self.days_worked[employee] -= 1
+        self.size -= 1
+        return shift
+    
+    def move(self, employee: str, day: str, new_day: str, new_shift: str):
+        # Caller guarantees the target day is free; the day count is unchanged.
+        shift = self.assigned_shift[employee].pop(day)
+        del self.slots[day][shift][employee]
+        self.slots[new_day][new_shift][employee] = None
+        self.day_mask[employee] = (self.day_mask[employee] & ~self.day_bits[day]) | self.day_bits[new_day]
+        self.assigned_shift[employee][new_day] = new_shift
+    
+    def remove_employee(self, employee: str) -> List[str]:
+        days = list(self.assigned_shift.get(employee, ()))
+        for day in days:
+            self.unplace(employee, day)
+        self.day_mask.pop(employee, None)
+        self.days_worked.pop(employee, None)
+        self.assigned_shift.pop(employee, None)
+        return days
+    
+    def shift_of(self, employee: str, day: str) -> Optional[str]:
+        shifts = self.assigned_shift.get(employee)
+        return shifts.get(day) if shifts else None
+    
+    def count(self, day: str, shift: str) -> int:
+        return len(self.slots[day][shift])
+    
+    def slot(self, day: str, shift: str) -> List[str]:
+        return list(self.slots[day][shift])
+    
+    def assignments(self) -> Iterator[Tuple[str, str, str]]:
+        for day, shifts in self.slots.items():
+            for shift, employees in shifts.items():
+                for employee in employees:
+                    yield employee, day, shift
+    
+    def as_schedule(self) -> Dict[str, Dict[str, List[str]]]:
+        return {day: {shift: list(employees) for shift, employees in shifts.items()}
+                for day, shifts in self.slots.items()}
+    
+    def verify(self) -> List[Tuple[str, str, str]]:
+        # place()/unplace() keep the slots and the per-employee index in step,
+        # so this only finds entries written around the store: slot members
+        # the index disagrees with, and index entries missing from their slot.
+        # Matching totals are the normal case and cost one len() per slot.
+        entries = sum(len(employees) for shifts in self.slots.values() for employees in shifts.values())
+        if entries == self.size:
+            return []
+        problems = [(employee, day, shift) for employee, day, shift in self.assignments()
+                    if self.shift_of(employee, day) != shift]
+        for employee, days in self.assigned_shift.items():
+            problems.extend((employee, day, shift) for day, shift in days.items()
+                            if employee not in self.slots[day][shift])
+        return problems
+    
+    def discard(self, employee: str, day: str, shift: str):
+        self.slots[day][shift].pop(employee, None)
+        if self.shift_of(employee, day) == shift:
+            del self.assigned_shift[employee][day]
+            self.day_mask[employee] &= ~self.day_bits[day]
+            self.days_worked[employee] -= 1
+            self.size -= 1
@@ -0,0 +1,70 @@
+import heapq
+import random
+from typing import Dict, List, Optional, Set
+from assignment_store import AssignmentStore
+
+
+class AvailabilityIndex:
+    
+    def __init__(self, employees: List[str], store: AssignmentStore,
+                 carryover: Dict[str, int] = None, rng: random.Random = None):
+        self.employees = employees
+        self.store = store
+        self.days_worked = store.days_worked
+        # Days already worked in earlier weeks of a horizon; they order
+        # candidates but do not count towards this week's cap.
+        self.carryover = carryover or {}
+        self.max_days = store.max_days
+        self._heaps: Dict[str, list] = {}
+        self._removed: Set[str] = set()
+        self.scanned = 0
+        # Random tie-breaks among equally loaded employees; pass a seeded
+        # Random for reproducible fills.
+        self._random = (rng or random).random
+    
+    def _heap_for(self, day: str) -> list:
+        heap = self._heaps.get(day)
+        if heap is None:
+            carryover = self.carryover
+            heap = [
+                (self.days_worked[emp] + carryover.get(emp, 0), self._random(), emp)
+                for emp in self.employees
+                if self.store.can_place(emp, day)
+            ]
+            heapq.heapify(heap)
+            self._heaps[day] = heap
+        return heap
+    
+    def pop_least_loaded(self, day: str) -> Optional[str]:
+        heap = self._heap_for(day)
+        while heap:
+            load, _, emp = heapq.heappop(heap)
+            self.scanned += 1
+            if emp in self._removed:
+                continue
+            if not self.store.can_place(emp, day):
+                continue
+            worked = self.days_worked[emp]
+            # Stale entries are re-pushed with their current load instead of
+            # being updated in place; touch() covers loads that went down.
+            current = worked + self.carryover.get(emp, 0)
+            if load != current:
+                heapq.heappush(heap, (current, self._random(), emp))
+                continue
+            return emp
+        return None
+    
+    def touch(self, emp: str):
+        # Called when an employee's load drops or they free up a day, so they
+        # are offered again at their new load by every heap built so far.
+        self._removed.discard(emp)
+        worked = self.days_worked[emp]
+        if worked >= self.max_days:
+            return
+        current = worked + self.carryover.get(emp, 0)
+        for day, heap in self._heaps.items():
+            if not self.store.works(emp, day):
+                heapq.heappush(heap, (current, self._random(), emp))
+    
+    def discard(self, emp: str):
+        self._removed.add(emp)
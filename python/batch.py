@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from events import NULL_SINK
+from file_loader import load_rows, load_stream
+from filenames import unique_filenames
+from scheduler import EmployeeScheduler
+from shift_calendar import ShiftCalendar
+
+# A job is (location, source, solver, output_path, calendar); source is either
+# a CSV path or the pre-split rows of that location from a combined file, and
+# a calendar of None means the scheduler's default week.
+Job = Tuple[str, Union[str, List[Tuple[int, List[str]]]], str, str, Optional[ShiftCalendar]]
+
+
+def _with_outputs(jobs: List[Tuple[str, Union[str, list]]], solver: str, output_dir: str,
+                  calendar: Optional[ShiftCalendar]) -> List[Job]:
+    filenames = unique_filenames(location for location, _ in jobs)
+    return [(location, source, solver, os.path.join(output_dir, filename + '.json'), calendar)
+            for (location, source), filename in zip(jobs, filenames)]
+
+
+def discover_jobs(input_path: str, output_dir: str, solver: str = "greedy",
+                  location_column: bool = False, calendar: ShiftCalendar = None) -> List[Job]:
+    if os.path.isdir(input_path):
+        return _with_outputs([
+            (os.path.splitext(name)[0], os.path.join(input_path, name))
+            for name in sorted(os.listdir(input_path))
+            if name.lower().endswith('.csv')
+        ], solver, output_dir, calendar)
+    
+    if not location_column:
+        location = os.path.splitext(os.path.basename(input_path))[0]
+        return _with_outputs([(location, input_path)], solver, output_dir, calendar)
+    
+    # Combined file: Location,Employee,Day,Shift1,... split into per-location rows.
+    rows_by_location: Dict[str, List[Tuple[int, List[str]]]] = {}
+    with open(input_path, 'r', newline='') as file:
+        for line_num, row in enumerate(csv.reader(file), 1):
+            if not row or not any(row) or row[0].strip().startswith('#'):
+                continue
+            rows_by_location.setdefault(row[0].strip(), []).append((line_num, row[1:]))
+    return _with_outputs(list(rows_by_location.items()), solver, output_dir, calendar)
+
+
+def solve_location(job: Job) -> dict:
+    # Any failure is reported against its location instead of escaping
+    # through pool.map and aborting the rest of the batch.
+    try:
+        return _solve_location(job)
+    except (OSError, csv.Error, UnicodeDecodeError) as e:
+        return {'location': job[0], 'error': str(e)}
+    except Exception as e:
+        return {'location': job[0], 'error': f"{type(e).__name__}: {e}"}
+
+
+def _solve_location(job: Job) -> dict:
+    location, source, solver, output_path, calendar = job
+    scheduler = EmployeeScheduler(sink=NULL_SINK, calendar=calendar)
+    if isinstance(source, str):
+        report = load_stream(scheduler, source)
+    else:
+        report = load_rows(scheduler, source, location)
+    
+    scheduler.assign_shifts(solver)
+    scheduler.resolve_conflicts()
+    statistics = scheduler.compute_statistics()
+    
+    with open(output_path, 'w') as file:
+        json.dump({
+            'location': location,
+            'schedule': scheduler.schedule,
+            'daysWorked': dict(scheduler.days_worked),
+            'employees': scheduler.employees,
+            'statistics': statistics,
+            'load': report.as_dict(),
+        }, file)
+    
+    return {
+        'location': location,
+        'output': output_path,
+        'employees': len(scheduler.employees),
+        'warnings': report.warning_count,
+        'statistics': statistics,
+    }
+
+
+def run_batch(jobs: List[Job], workers: Optional[int] = None,
+              chunksize: Optional[int] = None) -> List[dict]:
+    if not jobs:
+        return []
+    for output_dir in {os.path.dirname(job[3]) for job in jobs}:
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        return [solve_location(job) for job in jobs]
+    
+    # Several locations per task amortize pickling and IPC for small stores,
+    # while ~4 chunks per worker keeps the load balanced.
+    chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(solve_location, jobs, chunksize=chunksize))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, List
+from events import NULL_SINK
+from file_loader import load_from_file
+from result_cache import ResultCache
+from roster_generator import generate_records, write_csv
+from scheduler import EmployeeScheduler
+import web_ui
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+PHASES = ["load_from_file", "assign_shifts", "resolve_conflicts", "get_statistics", "generate_handler"]
+
+
+def _time(fn: Callable[[], None], repeat: int, setup: Callable[[], None] = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {'best': min(samples), 'median': statistics.median(samples), 'runs': len(samples)}
+
+
+class _Server:
+    
+    def __enter__(self):
+        # No result cache, so every request measures a full solve.
+        web_ui.SchedulerHandler.result_cache = ResultCache(0)
+        web_ui.SchedulerHandler.log_message = lambda *args: None
+        self.httpd = web_ui.PooledHTTPServer(("127.0.0.1", 0), web_ui.SchedulerHandler, workers=2)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/generate"
+        return self
+    
+    def post(self, body: bytes):
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+    
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _payload(csv_path: str, solver: str) -> bytes:
+    scheduler = EmployeeScheduler(sink=NULL_SINK)
+    load_from_file(scheduler, csv_path)
+    employees = [
+        {'name': name,
+         'preferences': [{'day': day, 'shifts': shifts}
+                         for day, shifts in scheduler.preferences[name].items()]}
+        for name in scheduler.employees
+    ]
+    return json.dumps({'employees': employees, 'solver': solver}).encode()
+
+
+def bench_size(size: int, args, workdir: str, server: _Server) -> List[dict]:
+    csv_path = os.path.join(workdir, f"roster_{size}.csv")
+    preferences = write_csv(csv_path, generate_records(size, args.density, args.priority,
+                                                       args.skew, args.seed))
+    repeat = args.repeat if size <= args.repeat_limit else 1
+    results = []
+    
+    def record(phase: str, timing: Dict[str, float]):
+        results.append({'size': size, 'preferences': preferences, 'solver': args.solver,
+                        'phase': phase, **timing})
+        print(f"{size:>8} {phase:20} best {timing['best']:10.5f}s  "
+              f"median {timing['median']:10.5f}s  ({timing['runs']} runs)")
+    
+    state = {}
+    
+    def fresh():
+        state['scheduler'] = EmployeeScheduler(sink=NULL_SINK)
+    
+    record("load_from_file", _time(lambda: load_from_file(state['scheduler'], csv_path),
+                                   repeat, setup=fresh))
+    scheduler = state['scheduler']
+    
+    def solve():
+        scheduler.assign_shifts(args.solver)
+    
+    record("assign_shifts", _time(solve, repeat))
+    record("resolve_conflicts", _time(scheduler.resolve_conflicts, repeat, setup=solve))
+    
+    def get_statistics():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.get_statistics()
+    
+    record("get_statistics", _time(get_statistics, repeat))
+    
+    body = _payload(csv_path, args.solver)
+    record("generate_handler", _time(lambda: server.post(body), repeat))
+    
+    os.remove(csv_path)
+    return results
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as file:
+        baseline = {(r['size'], r['solver'], r['phase']): r for r in json.load(file)['results']}
+    
+    regressions = 0
+    print(f"\nComparison with {baseline_path} (best times):")
+    for result in results:
+        old = baseline.get((result['size'], result['solver'], result['phase']))
+        if old is None or not old['best']:
+            continue
+        ratio = result['best'] / old['best']
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"{result['size']:>8} {result['phase']:20} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--density', type=float, default=0.5)
+    parser.add_argument('--priority', type=int, default=2)
+    parser.add_argument('--skew', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--solver', choices=EmployeeScheduler.SOLVERS, default="greedy")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--repeat-limit', type=int, default=10000,
+                        help="sizes above this run each phase once")
+    parser.add_argument('--output', default="benchmark_results.json")
+    parser.add_argument('--compare', metavar="BASELINE", help="earlier results JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+    
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, _Server() as server:
+        for size in args.sizes:
+            results.extend(bench_size(size, args, workdir, server))
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'options': {key: value for key, value in vars(args).items()
+                        if key not in ('output', 'compare', 'threshold')},
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nSaved {len(results)} measurements to {args.output}")
+    
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
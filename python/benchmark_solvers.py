@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from roster_generator import build_scheduler
+from scheduler import EmployeeScheduler
+from schedule_matrix import ScheduleMatrix
+
+
+def measure(scheduler: EmployeeScheduler, solver: str) -> dict:
+    start = time.perf_counter()
+    scheduler.assign_shifts(solver)
+    scheduler.resolve_conflicts()
+    elapsed = time.perf_counter() - start
+    
+    matrix = ScheduleMatrix.from_scheduler(scheduler)
+    counts = matrix.shift_counts()
+    missing = (matrix.min_per_shift - counts).clip(min=0)
+    return {
+        'seconds': elapsed,
+        'understaffed_slots': int((missing > 0).sum()),
+        'missing_seats': int(missing.sum()),
+        'preferences_met': int(matrix.preference_hits().sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare greedy and min-cost-flow solvers")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 12, 25, 50, 100, 200])
+    parser.add_argument('--density', type=float, default=0.45, help="chance of a preference per day")
+    parser.add_argument('--priority', type=int, default=3, help="max shifts per preference")
+    parser.add_argument('--skew', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    print(f"{'employees':>9}  {'solver':8} {'seconds':>9} {'understaffed':>12} {'missing':>8} {'prefs met':>9}")
+    for size in args.sizes:
+        for solver in EmployeeScheduler.SOLVERS:
+            scheduler = build_scheduler(size, density=args.density, max_priority=args.priority,
+                                        skew=args.skew, seed=args.seed)
+            result = measure(scheduler, solver)
+            print(f"{size:>9}  {solver:8} {result['seconds']:>9.4f} {result['understaffed_slots']:>12} "
+                  f"{result['missing_seats']:>8} {result['preferences_met']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Each command runs in a fresh interpreter, so the numbers include
+# interpreter startup and every import the command pulls in.
+COMMANDS = [
+    ("python -c pass", ["-c", "pass"]),
+    ("main.py help", ["main.py", "help"]),
+    ("import scheduler", ["-c", "import scheduler"]),
+    ("import run_modes", ["-c", "import run_modes"]),
+    ("import web_ui", ["-c", "import web_ui"]),
+]
+
+
+def time_command(args: List[str], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return {'best': min(samples), 'median': statistics.median(samples)}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_interactive(repeat: int, timeout: float = 30.0) -> Dict[str, float]:
+    # From launching `main.py interactive` to the first answered request.
+    samples = []
+    for _ in range(repeat):
+        port = _free_port()
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "main.py", "interactive", "--host", "127.0.0.1",
+                                    "--port", str(port)], cwd=HERE, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/calendar", timeout=1):
+                        break
+                except OSError:
+                    if process.poll() is not None or time.perf_counter() - start > timeout:
+                        raise RuntimeError("web UI did not start")
+                    time.sleep(0.005)
+            samples.append(time.perf_counter() - start)
+        finally:
+            process.terminate()
+            process.wait()
+    return {'best': min(samples), 'median': statistics.median(samples)}
+
+
+def slowest_imports(statement: str, count: int) -> List[Tuple[int, str]]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=HERE,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings.append((int(cumulative), name.rstrip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI and web UI startup time")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--imports', metavar="MODULE", default="web_ui",
+                        help="module whose slowest imports are listed (-X importtime)")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    
+    print(f"{'command':24} {'best ms':>9} {'median ms':>10}")
+    for label, command in COMMANDS:
+        result = time_command(command, args.repeat)
+        print(f"{label:24} {result['best'] * 1000:>9.1f} {result['median'] * 1000:>10.1f}")
+    result = time_interactive(max(1, args.repeat // 2))
+    print(f"{'interactive (ready)':24} {result['best'] * 1000:>9.1f} {result['median'] * 1000:>10.1f}")
+    
+    if args.top:
+        print(f"\nSlowest imports under 'import {args.imports}' (cumulative):")
+        for micros, name in slowest_imports(f"import {args.imports}", args.top):
+            print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+from events import NULL_SINK
+from multistart import score_schedule
+from scheduler import EmployeeScheduler
+from shift_calendar import ShiftCalendar
+
+Assignment = Tuple[str, str, str]
+PreferenceRecord = Tuple[str, str, List[str]]
+# One component: its employees and their preference records.
+Component = Tuple[List[str], List[PreferenceRecord]]
+# A worker's share: (solver, calendar, components).
+Job = Tuple[str, ShiftCalendar, List[Component]]
+
+
+def preference_components(scheduler: EmployeeScheduler) -> List[Component]:
+    # The union-find runs over slots rather than employees: an employee joins
+    # every (day, shift) slot they list, and there are only days * shifts
+    # slots however large the roster is. Employees without preferences touch
+    # no slot; they are left out here and only used by the reconciliation fill.
+    calendar = scheduler.calendar
+    day_index, shift_index = calendar.day_index, calendar.shift_index
+    width = len(calendar.shifts)
+    parent = list(range(calendar.num_slots))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    preferences = scheduler.preferences
+    anchors = []
+    for employee in scheduler.employees:
+        days = preferences.get(employee)
+        if not days:
+            continue
+        root = None
+        for day, shifts in days.items():
+            base = day_index[day] * width
+            for shift in shifts:
+                slot = find(base + shift_index[shift])
+                if root is None:
+                    root = slot
+                elif slot != root:
+                    parent[slot] = root
+        anchors.append((employee, root))
+    
+    # Components come out in order of their first employee, with members in
+    # roster order.
+    groups: Dict[int, Component] = {}
+    for employee, anchor in anchors:
+        names, records = groups.setdefault(find(anchor), ([], []))
+        names.append(employee)
+        records.extend((employee, day, shifts) for day, shifts in preferences[employee].items())
+    return list(groups.values())
+
+
+def _component_calendar(calendar: ShiftCalendar, records: List[PreferenceRecord]) -> ShiftCalendar:
+    # Demand only on the component's own slots, so the flow solver cannot
+    # pull its employees into slots another component is filling.
+    demand: Dict[str, Dict[str, int]] = {}
+    for _, day, shifts in records:
+        for shift in shifts:
+            demand.setdefault(day, {})[shift] = calendar.required(day, shift)
+    return ShiftCalendar(calendar.days, calendar.shifts, calendar.max_days, 0, demand)
+
+
+def solve_components(job: Job) -> List[Assignment]:
+    solver, calendar, components = job
+    assignments = []
+    for employees, records in components:
+        own = _component_calendar(calendar, records) if solver == "flow" else calendar
+        scheduler = EmployeeScheduler(sink=NULL_SINK, calendar=own)
+        scheduler.add_employees(employees)
+        scheduler.add_preferences(records)
+        if solver == "flow":
+            scheduler._assign_min_cost_flow()
+        else:
+            scheduler._assign_preferences_greedy()
+        assignments.extend(scheduler.store.assignments())
+    return assignments
+
+
+def solve_whole(scheduler: EmployeeScheduler, solver: str) -> EmployeeScheduler:
+    # The monolithic solve, on a scratch scheduler so the caller's metrics
+    # and store are untouched unless its result is adopted.
+    whole = EmployeeScheduler(sink=NULL_SINK, seed=scheduler.rng.getrandbits(64),
+                              calendar=scheduler.calendar)
+    whole.add_employees(scheduler.employees)
+    whole.add_preferences(scheduler.preference_records())
+    whole.assign_shifts(solver)
+    return whole
+
+
+def coverable_gap(scheduler: EmployeeScheduler) -> bool:
+    # Whether some short slot could gain an employee: one moved from a slot
+    # holding more than it needs on the same day, or one free that day who
+    # is under the cap or could give up a surplus slot on another day. If
+    # there is none, a whole-roster solve cannot cover more.
+    store = scheduler.store
+    short_days = set()
+    surplus = set()
+    for day, shift, required in scheduler.calendar.slots():
+        count = store.count(day, shift)
+        if count < required:
+            short_days.add(day)
+        elif count > required:
+            surplus.add((day, shift))
+    if not short_days:
+        return False
+    if any(day in short_days for day, _ in surplus):
+        return True
+    
+    cap = scheduler.MAX_DAYS_PER_WEEK
+    empty: Dict[str, str] = {}
+    for employee in scheduler.employees:
+        shifts = store.assigned_shift.get(employee, empty)
+        if len(shifts) == len(scheduler.DAYS) or short_days.issubset(shifts):
+            continue
+        if len(shifts) < cap or any(slot in surplus for slot in shifts.items()):
+            return True
+    return False
+
+
+def pack_components(components: List[Component], bins: int) -> List[List[Component]]:
+    # Largest first into the lightest bin, weighted by preference records.
+    loads = [0] * bins
+    packed: List[List[Component]] = [[] for _ in range(bins)]
+    for component in sorted(components, key=lambda c: len(c[1]), reverse=True):
+        lightest = loads.index(min(loads))
+        packed[lightest].append(component)
+        loads[lightest] += len(component[1])
+    return [components for components in packed if components]
+
+
+def assign_decomposed(scheduler: EmployeeScheduler, solver: str = "greedy",
+                      workers: Optional[int] = None) -> dict:
+    scheduler._check_solver(solver)
+    metrics = scheduler.metrics
+    with metrics.phase("decompose"):
+        components = preference_components(scheduler)
+    largest = max((len(employees) for employees, _ in components), default=0)
+    
+    # With one group there is nothing to split, so it is a plain solve.
+    if len(components) <= 1:
+        scheduler.assign_shifts(solver)
+        return {'components': len(components), 'largest': largest, 'workers': 1, 'resolved': False}
+    
+    with metrics.phase("decompose"):
+        workers = max(1, min(workers or os.cpu_count() or 1, len(components)))
+        jobs = [(solver, scheduler.calendar, share) for share in pack_components(components, workers)]
+    
+    # A single share gains nothing from a worker process.
+    with metrics.phase("component_solve"):
+        if len(jobs) <= 1:
+            results = [solve_components(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                results = list(pool.map(solve_components, jobs))
+    
+    # Components never share a slot or an employee, so their assignments
+    # merge without conflicts. Min staffing is shared across the whole
+    # roster, so the fill for short slots runs once, here, over everyone.
+    placed = scheduler.load_assignments(chain.from_iterable(results))
+    metrics.count("assignments", placed)
+    with metrics.phase("fill"):
+        scheduler._fill_understaffed()
+    
+    # A flow component keeps every preferred slot it won, and the fill only
+    # adds people, so nobody is moved to cover another component's gap. When
+    # a short slot could be covered by moving someone, the whole roster is
+    # solved once and that schedule replaces the merged one if it scores
+    # better. The greedy pass is per-employee, so its merged week already
+    # matches a monolithic solve.
+    resolved = False
+    if solver == "flow" and coverable_gap(scheduler):
+        score = score_schedule(scheduler)
+        with metrics.phase("global_solve"):
+            whole = solve_whole(scheduler, solver)
+            if score_schedule(whole) < score:
+                scheduler.load_assignments(whole.assignments())
+                resolved = True
+    return {
+        'components': len(components),
+        'largest': largest,
+        'workers': len(jobs),
+        'resolved': resolved,
+    }
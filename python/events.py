@@ -0,0 +1,122 @@
+import sys
+from collections import Counter
+from typing import List, Tuple
+
+RULE = "=" * 60
+THIN_RULE = "-" * 60
+
+MESSAGES = {
+    "employee_added": "Added employee: {employee}",
+    "employee_exists": "Employee {employee} already exists.",
+    "preference_added": "Added preference for {employee} on {day}: {shifts}",
+    "preference_updated": "Updated preference for {employee} on {day}: {shifts}",
+    "employee_removed": "Removed employee: {employee}",
+    "unassigned": "  Unassigned {employee} from {day} - {shift}",
+    "error": "Error: {message}",
+    "assignment_started": f"\n{RULE}\nSTARTING SHIFT ASSIGNMENT\n{RULE}",
+    "week_started": f"\n{THIN_RULE}\nWEEK {{week}}\n{THIN_RULE}",
+    "assigned": "Assigned {employee} to {day} - {shift}",
+    "not_assigned": "Could not assign {employee} to {day}",
+    "fill_started": f"\n{THIN_RULE}\nFILLING UNDERSTAFFED SHIFTS\n{THIN_RULE}",
+    "understaffed": "\n{day} - {shift} needs {needed} more employee(s)",
+    "fill_assigned": "  Assigned least-worked {employee} to {day} - {shift}",
+    "no_available": "  WARNING: No available employees for {day} - {shift}",
+    "assignment_completed": f"\n{RULE}\nSHIFT ASSIGNMENT COMPLETE\n{RULE}\n",
+    "conflicts_started": f"\n{RULE}\nRESOLVING CONFLICTS\n{RULE}",
+    "conflict": "CONFLICT on {day}: {employees} assigned to multiple shifts",
+    "conflict_kept": "  Keeping {employee} in {shift}",
+    "conflict_removed": "  Removed {employee} from {shift}",
+    "no_conflicts": "No conflicts detected.",
+    "conflicts_completed": f"{RULE}\n",
+    "load_started": "\nLoading data from {filename}...",
+    "file_not_found": "Error: File '{filename}' not found.",
+    "load_warning": "Warning: Line {line} {message}, skipping",
+    "loaded": "  Loaded: {employee} - {day}: {shifts}",
+    "load_completed": "\n✓ Successfully loaded {employees} employees with {preferences} preferences",
+    "load_failed": "Error reading file: {error}",
+    "cache_loaded": "  Loaded preferences from cache {path}",
+    "cache_written": "  Wrote preference cache {path}",
+    "cache_failed": "Warning: Could not write preference cache: {error}",
+    "cache_skipped": "  Not caching preferences: {reason}",
+}
+
+
+def format_event(event: str, fields: dict) -> str:
+    template = MESSAGES.get(event)
+    if template is None:
+        return f"{event}: {fields}"
+    values = {
+        key: ", ".join(value) if isinstance(value, (list, tuple, set, frozenset)) else value
+        for key, value in fields.items()
+    }
+    return template.format(**values)
+
+
+class EventSink:
+    
+    enabled = True
+    
+    def emit(self, event: str, **fields):
+        raise NotImplementedError
+
+
+class NullSink(EventSink):
+    
+    enabled = False
+    
+    def emit(self, event: str, **fields):
+        pass
+
+
+class PrintSink(EventSink):
+    
+    def __init__(self, stream=None):
+        self.stream = stream
+    
+    def emit(self, event: str, **fields):
+        print(format_event(event, fields), file=self.stream or sys.stdout)
+
+
+class BufferedSink(EventSink):
+    
+    def __init__(self):
+        self.events: List[Tuple[str, dict]] = []
+    
+    def emit(self, event: str, **fields):
+        self.events.append((event, fields))
+    
+    def lines(self) -> List[str]:
+        return [format_event(event, fields) for event, fields in self.events]
+    
+    def getvalue(self) -> str:
+        return "\n".join(self.lines())
+    
+    def clear(self):
+        self.events.clear()
+
+
+class LoggingSink(EventSink):
+    
+    def __init__(self, logger: "logging.Logger" = None, level: int = None):
+        # logging is imported here rather than at module load, since every
+        # other sink (and every CLI mode) gets by without it.
+        import logging
+        self.logger = logger or logging.getLogger("scheduler")
+        self.level = logging.INFO if level is None else level
+    
+    def emit(self, event: str, **fields):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, format_event(event, fields).strip(),
+                            extra={"event": event, "event_fields": fields})
+
+
+class CounterSink(EventSink):
+    
+    def __init__(self):
+        self.counts = Counter()
+    
+    def emit(self, event: str, **fields):
+        self.counts[event] += 1
+
+
+NULL_SINK = NullSink()
@@ -0,0 +1,185 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, Iterator, Mapping, Optional, TextIO, Tuple, Union
+from filenames import unique_filenames
+from scheduler import EmployeeScheduler
+from shift_calendar import ShiftCalendar
+
+Target = Union[str, os.PathLike, io.TextIOBase]
+ShiftTimes = Mapping[str, Tuple[str, str]]
+
+BUFFER_SIZE = 1 << 16
+ICS_LINE_OCTETS = 75
+CALENDAR_HEADER = ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Employee Scheduler//EN\r\n"
+                   "CALSCALE:GREGORIAN\r\n")
+
+
+@contextmanager
+def open_output(target: Target) -> Iterator[TextIO]:
+    # Paths are opened (and closed) here with a large write buffer; '-' is
+    # stdout and anything else is taken to be an open text stream, which is
+    # left open for the caller.
+    if target == '-':
+        yield sys.stdout
+    elif isinstance(target, (str, os.PathLike)):
+        with open(target, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE) as file:
+            yield file
+    else:
+        yield target
+
+
+def write_csv(scheduler: EmployeeScheduler, target: Target) -> int:
+    store = scheduler.store
+    with open_output(target) as out:
+        writer = csv.writer(out)
+        writer.writerow(["Day", "Shift", "Employee"])
+        writer.writerows(
+            (day, shift, employee)
+            for day, shift, _ in scheduler.calendar.slots()
+            for employee in store.slots[day][shift]
+        )
+    return store.size
+
+
+def write_json(scheduler: EmployeeScheduler, target: Target) -> int:
+    # Same document as a /generate response, written a slot and an employee
+    # at a time so the whole thing never exists as one string.
+    dumps = json.dumps
+    store = scheduler.store
+    with open_output(target) as out:
+        write = out.write
+        write('{"schedule": {')
+        for d, (day, shifts) in enumerate(store.slots.items()):
+            write(f'{", " if d else ""}{dumps(day)}: {{')
+            for s, (shift, employees) in enumerate(shifts.items()):
+                write(f'{", " if s else ""}{dumps(shift)}: {dumps(list(employees))}')
+            write('}')
+        write('}, "daysWorked": {')
+        days_worked = store.days_worked
+        for i, employee in enumerate(scheduler.employees):
+            write(f'{", " if i else ""}{dumps(employee)}: {days_worked.get(employee, 0)}')
+        write('}, "employees": [')
+        for i, employee in enumerate(scheduler.employees):
+            write(f'{", " if i else ""}{dumps(employee)}')
+        write(']}')
+    return store.size
+
+
+def _ics_text(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\n', '\\n'))
+
+
+def _ics_line(line: str) -> str:
+    # RFC 5545 caps content lines at 75 octets; longer ones continue on lines
+    # starting with a space. Splits land on character boundaries.
+    if len(line.encode('utf-8')) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start = size = 0
+    limit = ICS_LINE_OCTETS
+    for i, char in enumerate(line):
+        width = len(char.encode('utf-8'))
+        if size + width > limit:
+            parts.append(line[start:i])
+            start, size, limit = i, 0, ICS_LINE_OCTETS - 1
+        size += width
+    parts.append(line[start:])
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def next_week_start(day: date = None) -> date:
+    # The Monday on or after day: schedules are made for the coming week, so
+    # one exported on a Sunday is dated from the next day.
+    day = day or date.today()
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def _event_templates(calendar: ShiftCalendar, week_start: date,
+                     shift_times: ShiftTimes) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    # Calendar day i falls on week_start + i days. Shifts with times become
+    # timed events (ending the next day if the end is not after the start);
+    # the rest are all-day events. Everything but the UID's employee part is
+    # the same for every employee, so each slot's event text is built once.
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    templates = {}
+    for day, shift, _ in calendar.slots():
+        on = week_start + timedelta(days=calendar.day_index[day])
+        times = shift_times.get(shift)
+        if times:
+            start = datetime.combine(on, time.fromisoformat(times[0]))
+            end = datetime.combine(on, time.fromisoformat(times[1]))
+            if end <= start:
+                end += timedelta(days=1)
+            span = f"DTSTART:{start:%Y%m%dT%H%M%S}\r\nDTEND:{end:%Y%m%dT%H%M%S}\r\n"
+        else:
+            span = (f"DTSTART;VALUE=DATE:{on:%Y%m%d}\r\n"
+                    f"DTEND;VALUE=DATE:{on + timedelta(days=1):%Y%m%d}\r\n")
+        templates[day, shift] = (
+            f"BEGIN:VEVENT\r\nUID:{on:%Y%m%d}-{calendar.shift_index[shift]}-",
+            f"@employee-scheduler\r\nDTSTAMP:{stamp}\r\n{span}"
+            + _ics_line(f"SUMMARY:{_ics_text(shift)} shift") + "END:VEVENT\r\n",
+        )
+    return templates
+
+
+def _write_calendar(write: Callable[[str], int], calendar: ShiftCalendar, employee: str,
+                    shifts: Mapping[str, str], templates: Mapping[Tuple[str, str], Tuple[str, str]]) -> int:
+    uid = hashlib.sha1(employee.encode('utf-8')).hexdigest()[:16]
+    events = []
+    for day in sorted(shifts, key=calendar.day_index.__getitem__):
+        head, tail = templates[day, shifts[day]]
+        events.append(f"{head}{uid}{tail}")
+    write(f"{CALENDAR_HEADER}{_ics_line(f'X-WR-CALNAME:{_ics_text(employee)}')}"
+          f"{''.join(events)}END:VCALENDAR\r\n")
+    return len(events)
+
+
+def write_icalendar(scheduler: EmployeeScheduler, employee: str, target: Target,
+                    week_start: date = None, shift_times: ShiftTimes = None) -> int:
+    templates = _event_templates(scheduler.calendar, week_start or next_week_start(), shift_times or {})
+    with open_output(target) as out:
+        return _write_calendar(out.write, scheduler.calendar, employee,
+                               scheduler.store.assigned_shift.get(employee, {}), templates)
+
+
+def write_employee_calendars(scheduler: EmployeeScheduler, directory: str, week_start: date = None,
+                             shift_times: ShiftTimes = None) -> int:
+    # One .ics per employee, each written and closed before the next is
+    # started, so memory stays flat however large the roster is.
+    os.makedirs(directory, exist_ok=True)
+    calendar = scheduler.calendar
+    templates = _event_templates(calendar, week_start or next_week_start(), shift_times or {})
+    assigned_shift = scheduler.store.assigned_shift
+    written = 0
+    for employee, filename in zip(scheduler.employees, unique_filenames(scheduler.employees)):
+        with open(os.path.join(directory, filename + '.ics'), 'w', newline='', encoding='utf-8') as file:
+            _write_calendar(file.write, calendar, employee, assigned_shift.get(employee, {}), templates)
+        written += 1
+    return written
+
+
+EXPORTERS = {
+    '.csv': write_csv,
+    '.json': write_json,
+}
+
+
+def is_calendar_directory(target: str) -> bool:
+    # Only an explicit directory (a trailing separator, or one that already
+    # exists) gets per-employee calendars, so a mistyped extension is never
+    # mistaken for one.
+    return target.endswith(('/', os.sep)) or os.path.isdir(target)
+
+
+def exporter_for(target: str) -> Optional[Callable[[EmployeeScheduler, Target], int]]:
+    # '-' is the JSON document on stdout; files are picked by extension.
+    if target == '-':
+        return write_json
+    return EXPORTERS.get(os.path.splitext(target)[1].lower())
@@ -1,57 +1,188 @@
 import csv
+import io
 import os
+import sys
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
 from scheduler import EmployeeScheduler
+from preference_cache import PreferenceCacheWriter, cacheable, open_cache
 
+PreferenceRecord = Tuple[str, str, List[str]]
+Source = Union[str, os.PathLike, io.TextIOBase]
 
-def load_from_file(scheduler: EmployeeScheduler, filename: str) -> bool:
-    print(f"\nLoading data from {filename}...")
+DEFAULT_BATCH_SIZE = 10000
+MAX_STORED_WARNINGS = 1000
+
+
+class LoadReport:
+    
+    def __init__(self, source: str, max_warnings: int = MAX_STORED_WARNINGS):
+        self.source = source
+        self.max_warnings = max_warnings
+        self.rows_read = 0
+        self.preferences = 0
+        self.employees = 0
+        self.warning_count = 0
+        self.warnings: List[Tuple[int, str]] = []
+    
+    def warn(self, line: int, message: str):
+        self.warning_count += 1
+        # Only the first max_warnings are kept so a bad export can't grow memory.
+        if len(self.warnings) < self.max_warnings:
+            self.warnings.append((line, message))
+    
+    def as_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'rows_read': self.rows_read,
+            'preferences': self.preferences,
+            'employees': self.employees,
+            'warning_count': self.warning_count,
+            'warnings': [{'line': line, 'message': message} for line, message in self.warnings],
+        }
+
+
+def iter_rows(source: Source) -> Iterator[Tuple[int, List[str]]]:
+    if source == '-':
+        yield from enumerate(csv.reader(sys.stdin), 1)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', newline='') as file:
+            yield from enumerate(csv.reader(file), 1)
+    else:
+        yield from enumerate(csv.reader(source), 1)
+
+
+def iter_preference_records(rows: Iterable[Tuple[int, List[str]]], days: Iterable[str],
+                            shifts: Iterable[str], report: LoadReport) -> Iterator[PreferenceRecord]:
+    valid_days = set(days)
+    valid_shift_names = set(shifts)
+    
+    for line_num, row in rows:
+        if not row or not any(row):
+            continue
+        
+        if row[0].strip().startswith('#'):
+            continue
+        
+        report.rows_read += 1
+        
+        if len(row) < 3:
+            report.warn(line_num, "has insufficient data")
+            continue
+        
+        employee = row[0].strip()
+        day = row[1].strip()
+        
+        if day not in valid_days:
+            report.warn(line_num, f"has invalid day '{day}'")
+            continue
+        
+        valid_shifts = [s for s in map(str.strip, row[2:]) if s in valid_shift_names]
+        if not valid_shifts:
+            report.warn(line_num, "has no valid shifts")
+            continue
+        
+        yield employee, day, valid_shifts
+
+
+def batched(records: Iterable[PreferenceRecord], size: int) -> Iterator[List[PreferenceRecord]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _insert_batches(scheduler: EmployeeScheduler, records: Iterable[PreferenceRecord],
+                    batch_size: int, report: LoadReport,
+                    on_batch: Callable[[List[PreferenceRecord]], None] = None):
+    sink = scheduler.sink
+    verbose = sink.enabled
+    seen_employees = set()
     
-    if not os.path.exists(filename):
-        print(f"Error: File '{filename}' not found.")
+    for batch in batched(records, batch_size):
+        new_employees = {employee: None for employee, _, _ in batch
+                         if employee not in seen_employees}
+        seen_employees.update(new_employees)
+        scheduler.add_employees(new_employees)
+        report.preferences += scheduler.add_preferences(batch)
+        if on_batch is not None:
+            on_batch(batch)
+        if verbose:
+            for employee, day, shifts in batch:
+                sink.emit("loaded", employee=employee, day=day, shifts=shifts)
+    
+    report.employees = len(seen_employees)
+
+
+def load_stream(scheduler: EmployeeScheduler, source: Source,
+                batch_size: int = DEFAULT_BATCH_SIZE,
+                on_batch: Callable[[List[PreferenceRecord]], None] = None) -> LoadReport:
+    name = source if isinstance(source, str) else getattr(source, 'name', '<stream>')
+    report = LoadReport(str(name))
+    records = iter_preference_records(iter_rows(source), scheduler.DAYS, scheduler.SHIFTS, report)
+    _insert_batches(scheduler, records, batch_size, report, on_batch)
+    return report
+
+
+def load_rows(scheduler: EmployeeScheduler, rows: Iterable[Tuple[int, List[str]]],
+              name: str = '<rows>', batch_size: int = DEFAULT_BATCH_SIZE) -> LoadReport:
+    report = LoadReport(name)
+    records = iter_preference_records(rows, scheduler.DAYS, scheduler.SHIFTS, report)
+    _insert_batches(scheduler, records, batch_size, report)
+    return report
+
+
+def load_cached(scheduler: EmployeeScheduler, filename: str,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> LoadReport:
+    if not cacheable(scheduler.DAYS, scheduler.SHIFTS):
+        scheduler.sink.emit("cache_skipped", reason="too many days or shifts")
+        return load_stream(scheduler, filename, batch_size)
+    
+    cache = open_cache(filename, scheduler.DAYS, scheduler.SHIFTS)
+    if cache is not None:
+        with cache:
+            report = LoadReport(filename)
+            report.rows_read = cache.rows_read
+            report.warning_count = cache.warning_count
+            report.warnings = cache.warnings[:report.max_warnings]
+            _insert_batches(scheduler, cache.iter_records(), batch_size, report)
+        scheduler.sink.emit("cache_loaded", path=cache.path)
+        return report
+    
+    writer = PreferenceCacheWriter(scheduler.DAYS, scheduler.SHIFTS)
+    report = load_stream(scheduler, filename, batch_size, on_batch=writer.add_batch)
+    try:
+        path = writer.write(filename, report.rows_read, report.warning_count,
+                            warnings=report.warnings)
+        scheduler.sink.emit("cache_written", path=path)
+    except OSError as e:
+        scheduler.sink.emit("cache_failed", error=e)
+    return report
+
+
+def load_from_file(scheduler: EmployeeScheduler, filename: str,
+                   batch_size: int = DEFAULT_BATCH_SIZE, use_cache: bool = False) -> bool:
+    sink = scheduler.sink
+    sink.emit("load_started", filename=filename)
+    
+    if filename != '-' and not os.path.exists(filename):
+        sink.emit("file_not_found", filename=filename)
         return False
     
     try:
-        with open(filename, 'r') as file:
-            csv_reader = csv.reader(file)
-            
-            employees_added = set()
-            preferences_count = 0
-            
-            for line_num, row in enumerate(csv_reader, 1):
-                if not row or not any(row):
-                    continue
-                
-                if row[0].strip().startswith('#'):
-                    continue
-                
-                if len(row) < 3:
-                    print(f"Warning: Line {line_num} has insufficient data, skipping")
-                    continue
-                
-                employee = row[0].strip()
-                day = row[1].strip()
-                shifts = [s.strip() for s in row[2:] if s.strip()]
-                
-                if day not in scheduler.DAYS:
-                    print(f"Warning: Line {line_num} has invalid day '{day}', skipping")
-                    continue
-                
-                valid_shifts = [s for s in shifts if s in scheduler.SHIFTS]
-                if not valid_shifts:
-                    print(f"Warning: Line {line_num} has no valid shifts, skipping")
-                    continue
-                
-                if employee not in employees_added:
-                    scheduler.add_employee(employee)
-                    employees_added.add(employee)
-                
-                scheduler.preferences[employee][day] = valid_shifts
-                preferences_count += 1
-                print(f"  Loaded: {employee} - {day}: {', '.join(valid_shifts)}")
-            
-            print(f"\n✓ Successfully loaded {len(employees_added)} employees with {preferences_count} preferences")
-            return True
-            
+        with scheduler.metrics.phase("load"):
+            if use_cache and filename != '-':
+                report = load_cached(scheduler, filename, batch_size)
+            else:
+                report = load_stream(scheduler, filename, batch_size)
     except Exception as e:
-        print(f"Error reading file: {e}")
+        sink.emit("load_failed", error=e)
         return False
+    
+    for line, message in report.warnings:
+        sink.emit("load_warning", line=line, message=message)
+    scheduler.metrics.count("rows_read", report.rows_read)
+    sink.emit("load_completed", employees=report.employees, preferences=report.preferences)
+    return True
@@ -0,0 +1,20 @@
+import re
+from typing import Iterable, Iterator
+
+
+def location_filename(location: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', location) or '_'
+
+
+def unique_filenames(names: Iterable[str]) -> Iterator[str]:
+    # Names that sanitize to the same file name ("Store 1", "Store_1") get a
+    # numeric suffix; the check ignores case for case-insensitive filesystems.
+    used = set()
+    for name in names:
+        base = candidate = location_filename(name)
+        n = 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{base}_{n}"
+        used.add(candidate.lower())
+        yield candidate
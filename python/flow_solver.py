@@ -0,0 +1,197 @@
+import heapq
+from typing import Dict, List, Sequence, Tuple, Union
+
+# Coverage outweighs preferences, which outweigh preference rank; non-preferred
+# fill-ins cost a little, so they are only used to reach minimum staffing.
+COVER_BONUS = 1000
+PREFERENCE_BONUS = 100
+FILL_COST = 1
+INF = float('inf')
+
+
+class MinCostFlow:
+    
+    def __init__(self, n_nodes: int):
+        self.n_nodes = n_nodes
+        self.adj: List[List[int]] = [[] for _ in range(n_nodes)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+    
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        edge = len(self.to)
+        self.to += [v, u]
+        self.cap += [cap, 0]
+        self.cost += [cost, -cost]
+        self.adj[u].append(edge)
+        self.adj[v].append(edge + 1)
+        return edge
+    
+    def flow(self, edge: int) -> int:
+        return self.cap[edge ^ 1]
+    
+    def _initial_potentials(self, source: int) -> List[float]:
+        # Nodes are numbered in topological order and only forward edges have
+        # capacity initially, so one ordered relaxation pass is Bellman-Ford.
+        h = [INF] * self.n_nodes
+        h[source] = 0
+        to, cap, cost = self.to, self.cap, self.cost
+        for u in range(self.n_nodes):
+            if h[u] == INF:
+                continue
+            for edge in self.adj[u]:
+                if cap[edge] > 0 and h[u] + cost[edge] < h[to[edge]]:
+                    h[to[edge]] = h[u] + cost[edge]
+        return h
+    
+    def _augment_admissible(self, source: int, sink: int, h: List[float]) -> int:
+        # Pushes flow along every path of zero reduced cost (all of them are
+        # shortest paths under the current potentials), so one Dijkstra run
+        # serves many unit augmentations instead of one.
+        to, cap, cost, adj = self.to, self.cap, self.cost, self.adj
+        current = [0] * self.n_nodes
+        on_path = [False] * self.n_nodes
+        pushed = 0
+        
+        while True:
+            path = []
+            u = source
+            on_path[source] = True
+            while u != sink:
+                edges = adj[u]
+                i = current[u]
+                while i < len(edges):
+                    edge = edges[i]
+                    v = to[edge]
+                    if cap[edge] > 0 and not on_path[v] and cost[edge] + h[u] - h[v] == 0:
+                        break
+                    i += 1
+                current[u] = i
+                if i < len(edges):
+                    path.append(edge)
+                    u = to[edge]
+                    on_path[u] = True
+                elif path:
+                    on_path[u] = False
+                    edge = path.pop()
+                    u = to[edge ^ 1]
+                    current[u] += 1
+                else:
+                    on_path[source] = False
+                    return pushed
+            
+            push = min(cap[edge] for edge in path)
+            for edge in path:
+                cap[edge] -= push
+                cap[edge ^ 1] += push
+                on_path[to[edge]] = False
+            on_path[source] = False
+            pushed += push
+    
+    def solve(self, source: int, sink: int) -> Tuple[int, int]:
+        # Successive shortest paths, augmenting while the path cost is negative.
+        to, cap, cost, adj = self.to, self.cap, self.cost, self.adj
+        h = self._initial_potentials(source)
+        total_flow = total_cost = 0
+        
+        while True:
+            dist = [INF] * self.n_nodes
+            prev_edge = [-1] * self.n_nodes
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                if u == sink:
+                    break
+                hu = h[u]
+                for edge in adj[u]:
+                    if cap[edge] <= 0:
+                        continue
+                    v = to[edge]
+                    nd = d + cost[edge] + hu - h[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev_edge[v] = edge
+                        heapq.heappush(heap, (nd, v))
+            
+            if dist[sink] == INF:
+                break
+            # Capping at dist[sink] keeps reduced costs non-negative even though
+            # the search stopped as soon as the sink was settled.
+            reach = dist[sink]
+            for v in range(self.n_nodes):
+                h[v] += dist[v] if dist[v] < reach else reach
+            path_cost = h[sink] - h[source]
+            if path_cost >= 0:
+                break
+            
+            pushed = self._augment_admissible(source, sink, h)
+            total_flow += pushed
+            total_cost += pushed * path_cost
+        
+        return total_flow, total_cost
+
+
+def solve_week(employees: List[str], preferences: Dict[str, Dict[str, List[str]]],
+               days: List[str], shifts: List[str], max_days: int,
+               demand: Union[int, Sequence[int]],
+               fill_penalty: Dict[str, int] = None) -> List[Tuple[str, str, str, bool]]:
+    n_emp, n_days, n_shifts = len(employees), len(days), len(shifts)
+    # demand is one headcount for every slot, or a flat per-slot table
+    # indexed by day * len(shifts) + shift.
+    if isinstance(demand, int):
+        demand = [demand] * (n_days * n_shifts)
+    source = 0
+    emp_base = 1
+    emp_day_base = emp_base + n_emp
+    hub_base = emp_day_base + n_emp * n_days
+    slot_base = hub_base + n_days
+    sink = slot_base + n_days * n_shifts
+    graph = MinCostFlow(sink + 1)
+    shift_index = {shift: s for s, shift in enumerate(shifts)}
+    
+    fill_penalty = fill_penalty or {}
+    preferred_edges = []
+    fill_edges = []
+    for e, employee in enumerate(employees):
+        graph.add_edge(source, emp_base + e, max_days, 0)
+        employee_prefs = preferences.get(employee, {})
+        # Extra fill cost (e.g. days worked in earlier weeks) only reorders
+        # fill-ins; it is capped so it never outweighs a preference.
+        fill_cost = FILL_COST + min(fill_penalty.get(employee, 0), PREFERENCE_BONUS // 2)
+        for d, day in enumerate(days):
+            node = emp_day_base + e * n_days + d
+            graph.add_edge(emp_base + e, node, 1, 0)
+            for rank, shift in enumerate(employee_prefs.get(day, ())):
+                edge = graph.add_edge(node, slot_base + d * n_shifts + shift_index[shift],
+                                      1, rank - PREFERENCE_BONUS)
+                preferred_edges.append((edge, employee, day, shift))
+            # Fill-ins share one hub per day instead of an edge per shift.
+            fill_edges.append((graph.add_edge(node, hub_base + d, 1, fill_cost), employee, d))
+    
+    hub_edges = {}
+    for d in range(n_days):
+        for s in range(n_shifts):
+            slot = slot_base + d * n_shifts + s
+            hub_edges[d, s] = graph.add_edge(hub_base + d, slot, n_emp, 0)
+            graph.add_edge(slot, sink, demand[d * n_shifts + s], -COVER_BONUS)
+            graph.add_edge(slot, sink, n_emp, 0)
+    
+    graph.solve(source, sink)
+    
+    assignments = [(employee, day, shift, True)
+                   for edge, employee, day, shift in preferred_edges if graph.flow(edge)]
+    
+    fill_ins: List[List[str]] = [[] for _ in range(n_days)]
+    for edge, employee, d in fill_edges:
+        if graph.flow(edge):
+            fill_ins[d].append(employee)
+    for d, day in enumerate(days):
+        pool = fill_ins[d]
+        for s, shift in enumerate(shifts):
+            for _ in range(graph.flow(hub_edges[d, s])):
+                assignments.append((pool.pop(), day, shift, False))
+    
+    return assignments
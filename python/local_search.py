@@ -0,0 +1,149 @@
+import time
+from typing import Optional
+from flow_solver import COVER_BONUS, FILL_COST, PREFERENCE_BONUS
+from scheduler import EmployeeScheduler
+
+DEFAULT_ITERATIONS = 20000
+TIME_CHECK_INTERVAL = 256
+
+
+# The objective matches the flow solver's weights: each missing employee in a
+# slot costs COVER_BONUS, a preferred assignment earns PREFERENCE_BONUS minus
+# its rank, a fill-in costs FILL_COST, and the sum of squared days worked
+# breaks ties towards an even spread. Every move touches at most two slots and
+# two employees, so its delta is computed from those alone.
+class LocalSearch:
+    
+    def __init__(self, scheduler: EmployeeScheduler):
+        self.scheduler = scheduler
+        self.store = scheduler.store
+        self.preferences = scheduler.preferences
+        self.days_worked = scheduler.days_worked
+        self.calendar = scheduler.calendar
+        self.max_days = scheduler.MAX_DAYS_PER_WEEK
+        self.rng = scheduler.rng
+        self.moves = 0
+    
+    def value(self, employee: str, day: str, shift: str) -> int:
+        preferred = self.preferences.get(employee, {}).get(day)
+        if preferred and shift in preferred:
+            return PREFERENCE_BONUS - preferred.index(shift)
+        return -FILL_COST
+    
+    def _shortfall_delta(self, day: str, shift: str, change: int) -> int:
+        count = self.store.count(day, shift)
+        required = self.calendar.required(day, shift)
+        return COVER_BONUS * (max(0, required - count - change) - max(0, required - count))
+    
+    def objective(self) -> int:
+        total = 0
+        for day, shift, required in self.calendar.slots():
+            employees = self.store.slots[day][shift]
+            total += COVER_BONUS * max(0, required - len(employees))
+            total -= sum(self.value(emp, day, shift) for emp in employees)
+        total += sum(days * days for days in self.days_worked.values())
+        return total
+    
+    def delta_change_shift(self, employee: str, day: str, old: str, new: str) -> int:
+        return (self._shortfall_delta(day, old, -1) + self._shortfall_delta(day, new, 1)
+                + self.value(employee, day, old) - self.value(employee, day, new))
+    
+    def delta_relocate(self, employee: str, day: str, shift: str,
+                       new_day: str, new_shift: str) -> int:
+        return (self._shortfall_delta(day, shift, -1) + self._shortfall_delta(new_day, new_shift, 1)
+                + self.value(employee, day, shift) - self.value(employee, new_day, new_shift))
+    
+    def delta_add(self, employee: str, day: str, shift: str) -> int:
+        worked = self.days_worked[employee]
+        return (self._shortfall_delta(day, shift, 1) - self.value(employee, day, shift)
+                + 2 * worked + 1)
+    
+    def delta_swap(self, first: str, second: str, day: str, first_shift: str,
+                   second_shift: str) -> int:
+        # Slot sizes are unchanged, so only the two preference values move.
+        return (self.value(first, day, first_shift) + self.value(second, day, second_shift)
+                - self.value(first, day, second_shift) - self.value(second, day, first_shift))
+    
+    def _try_assigned(self, employee: str, day: str, shift: str) -> int:
+        rng = self.rng
+        scheduler = self.scheduler
+        kind = rng.randrange(3)
+        if kind == 0:
+            new_shift = rng.choice(scheduler.SHIFTS)
+            if new_shift == shift:
+                return 0
+            delta = self.delta_change_shift(employee, day, shift, new_shift)
+            if delta < 0:
+                self.store.move(employee, day, day, new_shift)
+            return delta
+        
+        if kind == 1:
+            new_day = rng.choice(scheduler.DAYS)
+            if self.store.works(employee, new_day):
+                return 0
+            new_shift = rng.choice(scheduler.SHIFTS)
+            delta = self.delta_relocate(employee, day, shift, new_day, new_shift)
+            if delta < 0:
+                self.store.move(employee, day, new_day, new_shift)
+            return delta
+        
+        # Swap partners are sampled from the roster rather than the slot so
+        # the pick stays O(1); partners not working another shift that day
+        # are skipped.
+        other = rng.choice(scheduler.employees)
+        other_shift = self.store.shift_of(other, day)
+        if other_shift is None or other_shift == shift:
+            return 0
+        delta = self.delta_swap(employee, other, day, shift, other_shift)
+        if delta < 0:
+            self.store.move(employee, day, day, other_shift)
+            self.store.move(other, day, day, shift)
+        return delta
+    
+    def _try_unassigned(self, employee: str, day: str) -> int:
+        if self.days_worked[employee] >= self.max_days:
+            return 0
+        shift = self.rng.choice(self.scheduler.SHIFTS)
+        delta = self.delta_add(employee, day, shift)
+        if delta < 0:
+            self.store.place(employee, day, shift)
+        return delta
+    
+    def run(self, max_iterations: int = DEFAULT_ITERATIONS,
+            time_limit: Optional[float] = None) -> dict:
+        scheduler = self.scheduler
+        employees = scheduler.employees
+        days = scheduler.DAYS
+        rng = self.rng
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        improvement = 0
+        iterations = 0
+        
+        while employees and iterations < max_iterations:
+            if deadline is not None and iterations % TIME_CHECK_INTERVAL == 0 \
+                    and time.perf_counter() >= deadline:
+                break
+            iterations += 1
+            employee = rng.choice(employees)
+            day = rng.choice(days)
+            shift = self.store.shift_of(employee, day)
+            if shift is None:
+                delta = self._try_unassigned(employee, day)
+            else:
+                delta = self._try_assigned(employee, day, shift)
+            if delta < 0:
+                improvement -= delta
+                self.moves += 1
+        
+        # Loads and free days changed underneath any availability heaps, so
+        # let the next incremental operation rebuild them.
+        scheduler._availability = None
+        return {'iterations': iterations, 'moves': self.moves, 'improvement': improvement}
+
+
+def improve_schedule(scheduler: EmployeeScheduler, max_iterations: int = DEFAULT_ITERATIONS,
+                     time_limit: Optional[float] = None) -> dict:
+    with scheduler.metrics.phase("local_search"):
+        result = LocalSearch(scheduler).run(max_iterations, time_limit)
+    scheduler.metrics.count("local_search_moves", result['moves'])
+    return result
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
 import sys
-import subprocess
-import os
-from run_modes import run_demo
+
+# Modes import their own dependencies when they run, so `help` and a mistyped
+# mode never pay for loading the scheduler, NumPy or the web server.
 
 
 def print_usage():
@@ -12,17 +12,30 @@ def print_usage():
     print("  python3 main.py [mode]")
     print("\nModes:")
     print("  demo          - Run with sample data (default)")
-    print("  interactive   - Launch web UI on http://localhost:8080")
+    print("  interactive   - Launch web UI on http://localhost:8888")
+    print("                  interactive [--port N] [--workers N] [--calendar calendar.json] [--db file]")
+    print("  console       - Enter employees and preferences at the prompt")
+    print("  file          - Schedule from a preference CSV")
+    print("                  file [data.csv] [--cache] [--db file] [--roster NAME]")
+    print("                       [--export out.csv|out.json|-|calendars/] [--week-start YYYY-MM-DD]")
+    print("                       [--calendar calendar.json]")
+    print("  batch         - Schedule many locations in parallel")
+    print("                  batch <dir-or-csv> [output-dir] [--workers N]")
+    print("                        [--solver greedy|flow] [--location-column]")
+    print("                        [--calendar calendar.json]")
     print("\nExamples:")
     print("  python3 main.py              # Runs demo")
     print("  python3 main.py demo         # Runs demo")
     print("  python3 main.py interactive  # Web UI")
+    print("  python3 main.py file roster.csv --export schedule.csv")
+    print("  python3 main.py batch stores/ out/ --workers 8")
     print()
 
 
 def main():
     
     if len(sys.argv) == 1:
+        from run_modes import run_demo
         run_demo()
     else:
         mode = sys.argv[1].lower()
@@ -30,11 +43,48 @@ def main():
         if mode in ['help', '-h', '--help']:
             print_usage()
         elif mode == 'demo':
+            from run_modes import run_demo
             run_demo()
         elif mode == 'interactive':
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            web_ui_path = os.path.join(script_dir, "web_ui.py")
-            subprocess.run([sys.executable, web_ui_path])
+            import web_ui
+            web_ui.main(sys.argv[2:])
+        elif mode == 'console':
+            from run_modes import run_interactive
+            run_interactive()
+        elif mode == 'file':
+            import argparse
+            from datetime import date
+            from run_modes import run_from_file
+            from storage import DEFAULT_ROSTER
+            parser = argparse.ArgumentParser(prog="main.py file")
+            parser.add_argument('filename', nargs='?', help="preference CSV (default: sample_data.csv)")
+            parser.add_argument('--cache', action='store_true', help="reuse or write a preference cache")
+            parser.add_argument('--db', help="SQLite file to save the roster and schedule to")
+            parser.add_argument('--roster', default=DEFAULT_ROSTER, help="roster name in the database")
+            parser.add_argument('--export', help=".csv or .json file, '-' for JSON on stdout, "
+                                "or a directory ending in '/' for .ics calendars")
+            parser.add_argument('--week-start', type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                help="date of the first calendar day in .ics exports "
+                                     "(default: the coming Monday)")
+            parser.add_argument('--calendar', help="JSON calendar with days, shifts and demand")
+            args = parser.parse_args(sys.argv[2:])
+            run_from_file(args.filename, args.cache, args.db, args.roster, args.export, args.calendar,
+                          args.week_start)
+        elif mode == 'batch':
+            import argparse
+            from run_modes import run_batch
+            from scheduler import EmployeeScheduler
+            parser = argparse.ArgumentParser(prog="main.py batch")
+            parser.add_argument('input', help="directory of CSVs or one CSV")
+            parser.add_argument('output_dir', nargs='?', default="schedules")
+            parser.add_argument('--workers', type=int)
+            parser.add_argument('--solver', choices=EmployeeScheduler.SOLVERS, default="greedy")
+            parser.add_argument('--location-column', action='store_true',
+                                help="first CSV column is the location")
+            parser.add_argument('--calendar', help="JSON calendar with days, shifts and demand")
+            args = parser.parse_args(sys.argv[2:])
+            run_batch(args.input, args.output_dir, args.workers, args.solver, args.location_column,
+                      args.calendar)
         else:
             print(f"Unknown mode: {mode}")
             print_usage()
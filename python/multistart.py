@@ -0,0 +1,85 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from events import NULL_SINK
+from scheduler import EmployeeScheduler
+from shift_calendar import ShiftCalendar
+
+# (understaffed slots, -preferred assignments, sum of squared days worked);
+# tuples compare lexicographically, so lower is better on every key.
+Score = Tuple[int, int, int]
+Assignment = Tuple[str, str, str]
+# A restart is (index, seed, solver, calendar, employees, preference records).
+Restart = Tuple[int, int, str, ShiftCalendar, List[str], List[Tuple[str, str, List[str]]]]
+
+
+def score_schedule(scheduler: EmployeeScheduler) -> Score:
+    store = scheduler.store
+    understaffed = sum(
+        max(0, required - store.count(day, shift))
+        for day, shift, required in scheduler.calendar.slots()
+    )
+    preferences = scheduler.preferences
+    preferred = sum(
+        1
+        for employee, day, shift in scheduler.assignments()
+        if shift in preferences.get(employee, {}).get(day, ())
+    )
+    spread = sum(days * days for days in scheduler.days_worked.values())
+    return understaffed, -preferred, spread
+
+
+def describe_score(score: Score) -> dict:
+    understaffed, preferred, spread = score
+    return {'understaffed': understaffed, 'preferred': -preferred, 'spread': spread}
+
+
+def restart_seeds(seed: Optional[int], restarts: int) -> List[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(restarts)]
+
+
+def solve_restart(restart: Restart) -> Tuple[Score, int, List[Assignment]]:
+    index, seed, solver, calendar, employees, records = restart
+    scheduler = EmployeeScheduler(sink=NULL_SINK, seed=seed, calendar=calendar)
+    scheduler.add_employees(employees)
+    scheduler.add_preferences(records)
+    scheduler.assign_shifts(solver)
+    scheduler.resolve_conflicts()
+    return score_schedule(scheduler), index, scheduler.assignments()
+
+
+def assign_best_of(scheduler: EmployeeScheduler, restarts: int, solver: str = "greedy",
+                   workers: Optional[int] = None) -> dict:
+    scheduler._check_solver(solver)
+    if restarts < 1:
+        raise ValueError("restarts must be at least 1")
+    # The flow solver has no random choices, so extra restarts would repeat it.
+    if solver == "flow":
+        restarts = 1
+    
+    employees = list(scheduler.employees)
+    records = scheduler.preference_records()
+    seeds = restart_seeds(scheduler.seed, restarts)
+    jobs = [(i, seed, solver, scheduler.calendar, employees, records)
+            for i, seed in enumerate(seeds)]
+    
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    if workers == 1:
+        results = [solve_restart(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(solve_restart, jobs))
+    
+    # Ties go to the lowest restart index, so the winner depends only on the
+    # seed and not on which worker finished first.
+    score, index, assignments = min(results, key=lambda result: result[:2])
+    scheduler.load_assignments(assignments)
+    return {
+        'restarts': restarts,
+        'best': index,
+        'seed': seeds[index],
+        'score': describe_score(score),
+        'scores': [describe_score(result[0]) for result in sorted(results, key=lambda r: r[1])],
+    }
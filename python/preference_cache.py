@@ -0,0 +1,215 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+CACHE_SUFFIX = ".prefcache"
+MAGIC = b"ESPC"
+VERSION = 2
+NO_SHIFT = 0xFF
+
+# magic, version, source size, source mtime_ns, source sha256, rows read,
+# warning count, record count, and byte lengths of the employee, day and
+# shift name tables and of the stored warnings that follow the header.
+HEADER = struct.Struct("<4sHQQ32sQQQIIII")
+# The source mtime, rewritten in place when a re-exported file hashes the same.
+MTIME = struct.Struct("<Q")
+MTIME_OFFSET = struct.calcsize("<4sHQ")
+
+PreferenceRecord = Tuple[str, str, List[str]]
+
+
+def cache_path_for(source: str) -> str:
+    return source + CACHE_SUFFIX
+
+
+def file_digest(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def cacheable(days: List[str], shifts: List[str]) -> bool:
+    # Day and shift indices are stored as single bytes, and NO_SHIFT pads
+    # the shift rows.
+    return len(days) <= 256 and len(shifts) < NO_SHIFT
+
+
+def _encode_names(names: List[str]) -> bytes:
+    return "\0".join(names).encode('utf-8')
+
+
+def _decode_names(blob: bytes) -> List[str]:
+    return blob.decode('utf-8').split("\0") if blob else []
+
+
+class PreferenceCacheWriter:
+    
+    def __init__(self, days: List[str], shifts: List[str]):
+        if not cacheable(days, shifts):
+            raise ValueError("Too many days or shifts to cache")
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.shift_index = {shift: i for i, shift in enumerate(self.shifts)}
+        self.employee_index = {}
+        # Later rows for the same employee and day overwrite earlier ones, so
+        # only the final preference per (employee, day) is cached.
+        self.records = {}
+    
+    def add_batch(self, batch: List[PreferenceRecord]):
+        employee_index = self.employee_index
+        day_index = self.day_index
+        shift_index = self.shift_index
+        width = len(self.shifts)
+        padding = bytes([NO_SHIFT]) * width
+        for employee, day, shifts in batch:
+            emp_id = employee_index.get(employee)
+            if emp_id is None:
+                emp_id = employee_index[employee] = len(employee_index)
+            row = bytes(shift_index[shift] for shift in shifts[:width])
+            self.records[emp_id, day_index[day]] = row + padding[len(row):]
+    
+    def write(self, source: str, rows_read: int = 0, warning_count: int = 0,
+              path: str = None, warnings: List[Tuple[int, str]] = ()) -> str:
+        path = path or cache_path_for(source)
+        stat = os.stat(source)
+        names = _encode_names(list(self.employee_index))
+        days = _encode_names(self.days)
+        shifts = _encode_names(self.shifts)
+        # The (line, message) pairs the loader kept, so a cache hit reports
+        # the same diagnostics as parsing the file.
+        stored_warnings = json.dumps(list(warnings)).encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, stat.st_size, stat.st_mtime_ns, file_digest(source),
+                             rows_read, warning_count, len(self.records),
+                             len(names), len(days), len(shifts), len(stored_warnings))
+        
+        employee_column = array('I', (emp_id for emp_id, _ in self.records))
+        day_column = bytes(day for _, day in self.records)
+        shift_matrix = b"".join(self.records.values())
+        
+        # Padding after the name tables keeps the uint32 employee column
+        # 4-byte aligned when the file is mapped.
+        tables = names + days + shifts + stored_warnings
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(header)
+            file.write(tables)
+            file.write(b"\0" * (-(len(header) + len(tables)) % 4))
+            file.write(employee_column.tobytes())
+            file.write(day_column)
+            file.write(shift_matrix)
+        os.replace(tmp_path, path)
+        return path
+
+
+class PreferenceCache:
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise
+        
+        (magic, version, self.source_size, self.source_mtime_ns, self.source_digest,
+         self.rows_read, self.warning_count, self.record_count,
+         names_len, days_len, shifts_len, warnings_len) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a preference cache (version {VERSION})")
+        
+        offset = HEADER.size
+        self.employees = _decode_names(self._map[offset:offset + names_len])
+        offset += names_len
+        self.days = _decode_names(self._map[offset:offset + days_len])
+        offset += days_len
+        self.shifts = _decode_names(self._map[offset:offset + shifts_len])
+        offset += shifts_len
+        self.warnings = [(line, message) for line, message in
+                         json.loads(self._map[offset:offset + warnings_len].decode('utf-8'))]
+        offset += warnings_len
+        offset += -offset % 4
+        
+        n = self.record_count
+        width = len(self.shifts)
+        self._view = memoryview(self._map)
+        self._employee_column = self._view[offset:offset + n * 4].cast('I')
+        offset += n * 4
+        self._day_column = self._view[offset:offset + n]
+        offset += n
+        self._shift_matrix = self._view[offset:offset + n * width]
+    
+    def matches(self, source: str, days: List[str], shifts: List[str]) -> bool:
+        if self.days != list(days) or self.shifts != list(shifts):
+            return False
+        stat = os.stat(source)
+        if stat.st_size != self.source_size:
+            return False
+        if stat.st_mtime_ns == self.source_mtime_ns:
+            return True
+        if file_digest(source) != self.source_digest:
+            return False
+        self._restamp(stat.st_mtime_ns)
+        return True
+    
+    def _restamp(self, mtime_ns: int):
+        # Re-exported but unchanged: record the new mtime so the next load
+        # skips the hash. A cache that cannot be written is still valid; it
+        # is just hashed again next time.
+        try:
+            with open(self.path, 'r+b') as file:
+                file.seek(MTIME_OFFSET)
+                file.write(MTIME.pack(mtime_ns))
+        except OSError:
+            return
+        self.source_mtime_ns = mtime_ns
+    
+    def iter_records(self) -> Iterator[PreferenceRecord]:
+        employees, days, shifts = self.employees, self.days, self.shifts
+        width = len(shifts)
+        matrix = self._shift_matrix
+        # Decode each distinct shift row once; rows repeat heavily in practice.
+        decoded = {}
+        for i, (emp_id, day) in enumerate(zip(self._employee_column, self._day_column)):
+            row = bytes(matrix[i * width:(i + 1) * width])
+            names = decoded.get(row)
+            if names is None:
+                names = decoded[row] = [shifts[s] for s in row if s != NO_SHIFT]
+            yield employees[emp_id], days[day], list(names)
+    
+    def close(self):
+        for attr in ('_employee_column', '_day_column', '_shift_matrix', '_view'):
+            view = getattr(self, attr, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_cache(source: str, days: List[str], shifts: List[str],
+               path: str = None) -> Optional[PreferenceCache]:
+    path = path or cache_path_for(source)
+    if not os.path.exists(path):
+        return None
+    try:
+        cache = PreferenceCache(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if not cache.matches(source, days, shifts):
+        cache.close()
+        return None
+    return cache
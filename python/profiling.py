@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable
+
+PROFILERS = ("cprofile", "tracemalloc")
+PROFILE_TOP = 25
+
+# tracemalloc is process-wide, so only one request is captured at a time.
+_capture_lock = threading.Lock()
+
+
+class PhaseTimer:
+    
+    def __init__(self):
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.counters = Counter()
+    
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+    
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+    
+    def as_dict(self) -> dict:
+        return {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': dict(self.counters),
+        }
+    
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.timings.items())
+
+
+@contextmanager
+def capture_profile(profilers: Iterable[str], top: int = PROFILE_TOP):
+    profilers = set(profilers)
+    result = {}
+    if not profilers:
+        yield result
+        return
+    
+    # Only instrumented requests need these, so they stay out of startup.
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+    with _capture_lock:
+        profiler = cProfile.Profile() if "cprofile" in profilers else None
+        tracing = "tracemalloc" in profilers and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield result
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+                result['cprofile'] = out.getvalue()
+            if tracing:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result['tracemalloc'] = {
+                    'current_bytes': current,
+                    'peak_bytes': peak,
+                    'top': [str(stat) for stat in snapshot.statistics('lineno')[:top]],
+                }
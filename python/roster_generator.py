@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import random
+from typing import Iterator, List, Sequence, Tuple
+from events import NULL_SINK
+from scheduler import EmployeeScheduler
+
+PreferenceRecord = Tuple[str, str, List[str]]
+
+
+def _weights(count: int, skew: float) -> List[float]:
+    # Zipf-like popularity: skew 0 is uniform, larger values concentrate
+    # preferences on the first days/shifts.
+    return [1.0 / (rank + 1) ** skew for rank in range(count)]
+
+
+def _weighted_sample(rng: random.Random, items: Sequence[str], weights: List[float], k: int) -> List[str]:
+    items, weights = list(items), list(weights)
+    chosen = []
+    for _ in range(min(k, len(items))):
+        i = rng.choices(range(len(items)), weights)[0]
+        chosen.append(items.pop(i))
+        weights.pop(i)
+    return chosen
+
+
+def employee_names(num_employees: int) -> List[str]:
+    return [f"Employee{i:06d}" for i in range(num_employees)]
+
+
+def generate_records(num_employees: int, density: float = 0.5, max_priority: int = 2,
+                     skew: float = 0.0, seed: int = 0,
+                     days: Sequence[str] = EmployeeScheduler.DAYS,
+                     shifts: Sequence[str] = EmployeeScheduler.SHIFTS) -> Iterator[PreferenceRecord]:
+    rng = random.Random(seed)
+    day_weights = _weights(len(days), skew)
+    mean_weight = sum(day_weights) / len(day_weights)
+    day_chance = [min(1.0, density * w / mean_weight) for w in day_weights]
+    shift_weights = _weights(len(shifts), skew)
+    
+    for name in employee_names(num_employees):
+        for day, chance in zip(days, day_chance):
+            if rng.random() < chance:
+                length = rng.randint(1, max(1, max_priority))
+                yield name, day, _weighted_sample(rng, shifts, shift_weights, length)
+
+
+def build_scheduler(num_employees: int, sink=NULL_SINK, **options) -> EmployeeScheduler:
+    scheduler = EmployeeScheduler(sink=sink)
+    scheduler.add_employees(employee_names(num_employees))
+    scheduler.add_preferences(generate_records(num_employees, **options))
+    return scheduler
+
+
+def write_csv(path: str, records: Iterator[PreferenceRecord]) -> int:
+    count = 0
+    with open(path, 'w', newline='') as file:
+        file.write("# Synthetic roster\n# Format: EmployeeName,Day,Shift1,Shift2,Shift3\n")
+        writer = csv.writer(file)
+        for employee, day, shifts in records:
+            writer.writerow([employee, day, *shifts])
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic preference CSV")
+    parser.add_argument('employees', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--density', type=float, default=0.5, help="chance of a preference per day")
+    parser.add_argument('--priority', type=int, default=2, help="max shifts per preference")
+    parser.add_argument('--skew', type=float, default=0.0, help="popularity skew (0 = uniform)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    count = write_csv(args.output, generate_records(args.employees, args.density, args.priority,
+                                                    args.skew, args.seed))
+    print(f"Wrote {count} preferences for {args.employees} employees to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 import os
+from datetime import date
 from scheduler import EmployeeScheduler
 from file_loader import load_from_file
+from shift_calendar import load_calendar
+from storage import DEFAULT_ROSTER
+
+# Exporters, batch (and with it multiprocessing) and the database are
+# imported by the modes that use them, so other modes start without them.
 
 
 def run_demo():
@@ -92,16 +98,17 @@ def run_interactive():
     # Add preferences
     print("\n" + "-"*70)
     print("Add shift preferences for each employee")
-    print("Format: Enter shift numbers separated by spaces (1=Morning, 2=Afternoon, 3=Evening)")
+    shift_map = {str(i): shift for i, shift in enumerate(scheduler.SHIFTS, 1)}
+    numbers = "/".join(shift_map)
+    print("Format: Enter shift numbers separated by spaces ("
+          + ", ".join(f"{num}={shift}" for num, shift in shift_map.items()) + ")")
     print("Or press Enter to skip a day")
     print("-"*70 + "\n")
     
-    shift_map = {"1": "Morning", "2": "Afternoon", "3": "Evening"}
-    
     for employee in scheduler.employees:
         print(f"\nPreferences for {employee}:")
         for day in scheduler.DAYS:
-            pref_input = input(f"  {day} (1/2/3 or Enter to skip): ").strip()
+            pref_input = input(f"  {day} ({numbers} or Enter to skip): ").strip()
             if pref_input:
                 shift_nums = pref_input.split()
                 shifts = [shift_map[num] for num in shift_nums if num in shift_map]
@@ -114,19 +121,40 @@ def run_interactive():
     scheduler.get_statistics()
 
 
-def run_from_file(filename: str = None):
+def run_from_file(filename: str = None, use_cache: bool = False, database: str = None,
+                  roster: str = DEFAULT_ROSTER, export: str = None, calendar_path: str = None,
+                  week_start: date = None):
     print("\n" + "="*70)
     print("EMPLOYEE SCHEDULING SYSTEM - FILE IMPORT MODE")
     print("="*70 + "\n")
     
-    scheduler = EmployeeScheduler()
+    calendar = None
+    if calendar_path:
+        try:
+            calendar = load_calendar(calendar_path)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error: could not load calendar '{calendar_path}': {e}")
+            return
+    
+    # The export target is checked before any work is done.
+    exporter = calendars = None
+    if export:
+        from exporters import exporter_for, is_calendar_directory
+        calendars = is_calendar_directory(export)
+        exporter = None if calendars else exporter_for(export)
+        if not calendars and exporter is None:
+            print(f"Error: cannot export to '{export}': use a .csv or .json file, '-' for JSON "
+                  f"on stdout, or a directory ending in '/' for .ics calendars")
+            return
+    
+    scheduler = EmployeeScheduler(calendar=calendar)
     
     if not filename:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         filename = os.path.join(os.path.dirname(script_dir), "sample_data.csv")
         print(f"Using default file: {filename}")
     
-    if not load_from_file(scheduler, filename):
+    if not load_from_file(scheduler, filename, use_cache=use_cache):
         print("\nFailed to load data from file. Exiting...")
         return
     
@@ -138,3 +166,61 @@ def run_from_file(filename: str = None):
     scheduler.resolve_conflicts()
     scheduler.display_schedule()
     scheduler.get_statistics()
+    
+    if calendars:
+        from exporters import write_employee_calendars
+        count = write_employee_calendars(scheduler, export, week_start)
+        print(f"✓ Wrote {count} employee calendar(s) to {export}")
+    elif export == '-':
+        exporter(scheduler, export)
+        print()
+    elif exporter is not None:
+        exporter(scheduler, export)
+        print(f"✓ Exported schedule to {export}")
+    
+    if database:
+        from storage import ScheduleDatabase
+        with ScheduleDatabase(database) as db:
+            version = scheduler.save(db, roster, label=os.path.basename(filename))
+        print(f"✓ Saved roster '{roster}' and schedule version {version} to {database}")
+
+
+def run_batch(input_path: str, output_dir: str = None, workers: int = None,
+              solver: str = "greedy", location_column: bool = False, calendar_path: str = None):
+    print("\n" + "="*70)
+    print("EMPLOYEE SCHEDULING SYSTEM - BATCH MODE")
+    print("="*70 + "\n")
+    
+    if not os.path.exists(input_path):
+        print(f"Error: '{input_path}' not found.")
+        return
+    
+    calendar = None
+    if calendar_path:
+        try:
+            calendar = load_calendar(calendar_path)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error: could not load calendar '{calendar_path}': {e}")
+            return
+    
+    output_dir = output_dir or "schedules"
+    from batch import discover_jobs, run_batch as run_batch_jobs
+    jobs = discover_jobs(input_path, output_dir, solver, location_column, calendar)
+    if not jobs:
+        print("No locations found. Exiting...")
+        return
+    
+    print(f"Scheduling {len(jobs)} location(s) with {workers or os.cpu_count()} worker(s)...\n")
+    results = run_batch_jobs(jobs, workers)
+    
+    failed = 0
+    for result in results:
+        if 'error' in result:
+            failed += 1
+            print(f"  {result['location']:24} ERROR: {result['error']}")
+            continue
+        stats = result['statistics']
+        print(f"  {result['location']:24} {result['employees']:6} employees  "
+              f"{stats['understaffed_shifts']:3} understaffed  → {result['output']}")
+    
+    print(f"\n✓ Wrote {len(results) - failed} schedule(s) to {output_dir}")
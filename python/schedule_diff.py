@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+Assignment = Tuple[str, str, str]
+Schedule = Mapping[str, Mapping[str, Iterable[str]]]
+# (employee, day, old shift, new shift)
+Move = Tuple[str, str, str, str]
+
+
+def schedule_assignments(schedule: Schedule) -> Iterator[Assignment]:
+    # A slot must hold a list of names; a bare string would otherwise be
+    # read one character at a time.
+    for day, shifts in schedule.items():
+        for shift, employees in shifts.items():
+            if not isinstance(employees, list) or not all(isinstance(e, str) for e in employees):
+                raise ValueError(f"{day} - {shift} must be a list of employee names")
+            for employee in employees:
+                yield employee, day, shift
+
+
+def assignment_index(assignments: Iterable[Assignment]) -> Dict[str, Dict[str, str]]:
+    # employee -> {day: shift}, the same shape as AssignmentStore.assigned_shift.
+    # A valid schedule has at most one entry per employee and day; anything
+    # else has no single shift to compare, so it is rejected.
+    index: Dict[str, Dict[str, str]] = {}
+    for employee, day, shift in assignments:
+        days = index.get(employee)
+        if days is None:
+            index[employee] = days = {}
+        elif day in days:
+            raise ValueError(f"{employee} is listed more than once on {day}")
+        days[day] = shift
+    return index
+
+
+class ScheduleDiff:
+    
+    def __init__(self, added: List[Assignment], removed: List[Assignment], moved: List[Move]):
+        self.added = added
+        self.removed = removed
+        self.moved = moved
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.moved)
+    
+    def employees(self) -> List[str]:
+        # Everyone to notify, in order of first appearance.
+        changed = dict.fromkeys(employee for employee, *_ in self.removed)
+        changed.update(dict.fromkeys(employee for employee, *_ in self.moved))
+        changed.update(dict.fromkeys(employee for employee, *_ in self.added))
+        return list(changed)
+    
+    def as_dict(self) -> dict:
+        return {
+            'added': [{'employee': e, 'day': d, 'shift': s} for e, d, s in self.added],
+            'removed': [{'employee': e, 'day': d, 'shift': s} for e, d, s in self.removed],
+            'moved': [{'employee': e, 'day': d, 'from': old, 'to': new} for e, d, old, new in self.moved],
+            'employees': self.employees(),
+        }
+    
+    def as_compact(self) -> dict:
+        # Employees, days and shifts are each listed once and every change is
+        # an array of indices into those tables: [e, d, s] for added and
+        # removed, [e, d, from, to] for moved.
+        tables: Tuple[Dict[str, int], Dict[str, int], Dict[str, int]] = ({}, {}, {})
+        employees, days, shifts = tables
+        
+        def ids(table: Dict[str, int], name: str) -> int:
+            i = table.get(name)
+            if i is None:
+                i = table[name] = len(table)
+            return i
+        
+        def encode(entries: List[tuple], kinds: Tuple[Dict[str, int], ...]) -> List[List[int]]:
+            return [[ids(table, name) for table, name in zip(kinds, entry)] for entry in entries]
+        
+        return {
+            'removed': encode(self.removed, tables),
+            'moved': encode(self.moved, (employees, days, shifts, shifts)),
+            'added': encode(self.added, tables),
+            'employees': list(employees),
+            'days': list(days),
+            'shifts': list(shifts),
+        }
+
+
+def diff_assignments(old: Iterable[Assignment], new: Iterable[Assignment]) -> ScheduleDiff:
+    # Each side is indexed once by employee and day, then every entry is
+    # looked up in the other index: O(len(old) + len(new)) overall. A change
+    # of shift on the same day is a move; a change of day is a removal plus
+    # an addition.
+    old_index = assignment_index(old)
+    new_index = assignment_index(new)
+    added: List[Assignment] = []
+    removed: List[Assignment] = []
+    moved: List[Move] = []
+    empty: Dict[str, str] = {}
+    
+    for employee, days in old_index.items():
+        new_days = new_index.get(employee, empty)
+        for day, shift in days.items():
+            new_shift = new_days.get(day)
+            if new_shift is None:
+                removed.append((employee, day, shift))
+            elif new_shift != shift:
+                moved.append((employee, day, shift, new_shift))
+    
+    for employee, days in new_index.items():
+        old_days = old_index.get(employee, empty)
+        added.extend((employee, day, shift) for day, shift in days.items() if day not in old_days)
+    
+    return ScheduleDiff(added, removed, moved)
+
+
+def diff_schedules(old: Schedule, new: Schedule) -> ScheduleDiff:
+    return diff_assignments(schedule_assignments(old), schedule_assignments(new))
@@ -0,0 +1,126 @@
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NO_PREFERENCE = -1
+
+
+class ScheduleMatrix:
+    
+    def __init__(self, employees: List[str], days: List[str], shifts: List[str],
+                 max_days: int, min_per_shift):
+        if np is None:
+            raise ImportError("ScheduleMatrix requires numpy (pip install numpy)")
+        
+        self.employees = list(employees)
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.max_days = max_days
+        # A single headcount or a flat per-slot table (day-major), as held by
+        # ShiftCalendar.demand; either way it is stored as a (days, shifts) array.
+        n_slots = len(self.days) * len(self.shifts)
+        demand = np.broadcast_to(np.asarray(min_per_shift, dtype=np.int32), (n_slots,))
+        self.min_per_shift = demand.reshape(len(self.days), len(self.shifts))
+        self.employee_index = {name: i for i, name in enumerate(self.employees)}
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.shift_index = {shift: i for i, shift in enumerate(self.shifts)}
+        
+        shape = (len(self.employees), len(self.days), len(self.shifts))
+        self.assignments = np.zeros(shape, dtype=np.int8)
+        self.priority = np.full(shape, NO_PREFERENCE, dtype=np.int8)
+    
+    @classmethod
+    def from_scheduler(cls, scheduler, with_preferences: bool = True) -> "ScheduleMatrix":
+        matrix = cls(scheduler.employees, scheduler.DAYS, scheduler.SHIFTS,
+                     scheduler.MAX_DAYS_PER_WEEK, scheduler.calendar.demand)
+        if with_preferences:
+            matrix.load_preferences(scheduler.preferences)
+        matrix.load_schedule(scheduler.schedule)
+        return matrix
+    
+    def load_preferences(self, preferences: Dict[str, Dict[str, List[str]]]):
+        emp_index, day_index, shift_index = self.employee_index, self.day_index, self.shift_index
+        for employee, days in preferences.items():
+            e = emp_index.get(employee)
+            if e is None:
+                continue
+            for day, shifts in days.items():
+                d = day_index[day]
+                for rank, shift in enumerate(shifts):
+                    self.priority[e, d, shift_index[shift]] = rank
+    
+    def load_schedule(self, schedule: Dict[str, Dict[str, List[str]]]):
+        self.assignments.fill(0)
+        emp_index = self.employee_index
+        for day, shifts in schedule.items():
+            d = self.day_index[day]
+            for shift, employees in shifts.items():
+                s = self.shift_index[shift]
+                rows = [emp_index[emp] for emp in employees]
+                # Duplicates are counted so conflicts stay visible to the checks.
+                np.add.at(self.assignments, (rows, d, s), 1)
+    
+    def to_schedule(self) -> Dict[str, Dict[str, List[str]]]:
+        schedule = {day: {shift: [] for shift in self.shifts} for day in self.days}
+        for e, d, s in zip(*np.nonzero(self.assignments)):
+            name = self.employees[e]
+            slot = schedule[self.days[d]][self.shifts[s]]
+            slot.extend([name] * int(self.assignments[e, d, s]))
+        return schedule
+    
+    def to_days_worked(self) -> Dict[str, int]:
+        return dict(zip(self.employees, self.days_worked().tolist()))
+    
+    def apply_to(self, scheduler) -> int:
+        # Goes through the scheduler's assignment store, so duplicate or
+        # over-limit cells are dropped rather than copied across.
+        return scheduler.load_assignments(
+            (self.employees[e], self.days[d], self.shifts[s])
+            for e, d, s in zip(*np.nonzero(self.assignments))
+        )
+    
+    def assign(self, employee: str, day: str, shift: str):
+        self.assignments[self.employee_index[employee], self.day_index[day], self.shift_index[shift]] += 1
+    
+    def days_worked(self):
+        return self.assignments.sum(axis=(1, 2), dtype=np.int32)
+    
+    def shift_counts(self):
+        return self.assignments.sum(axis=0, dtype=np.int32)
+    
+    def over_limit(self):
+        return self.days_worked() > self.max_days
+    
+    def multi_shift_days(self):
+        return self.assignments.sum(axis=2, dtype=np.int32) > 1
+    
+    def understaffed(self):
+        return self.shift_counts() < self.min_per_shift
+    
+    def preference_hits(self):
+        return (self.assignments > 0) & (self.priority != NO_PREFERENCE)
+    
+    def violations(self) -> Dict[str, list]:
+        over = np.nonzero(self.over_limit())[0]
+        multi = np.nonzero(self.multi_shift_days())
+        under = np.nonzero(self.understaffed())
+        return {
+            'over_limit': [self.employees[e] for e in over],
+            'multiple_shifts': [(self.employees[e], self.days[d]) for e, d in zip(*multi)],
+            'understaffed': [(self.days[d], self.shifts[s]) for d, s in zip(*under)],
+        }
+    
+    def statistics(self) -> Dict[str, float]:
+        counts = self.shift_counts()
+        n_employees = len(self.employees)
+        total_days = int(self.assignments.sum())
+        return {
+            'total_shifts': int(counts.size),
+            'filled_shifts': int(np.count_nonzero(counts)),
+            'understaffed_shifts': int(np.count_nonzero(counts < self.min_per_shift)),
+            'total_employees': n_employees,
+            'average_days': total_days / n_employees if n_employees else 0,
+        }
@@ -1,209 +1,536 @@
 import random
+import sys
 from collections import defaultdict
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
+from assignment_store import AssignmentStore
+from availability import AvailabilityIndex
+from events import EventSink, PrintSink
+from flow_solver import solve_week
+from profiling import PhaseTimer
+from shift_calendar import (DEFAULT_DAYS, DEFAULT_MAX_DAYS, DEFAULT_MIN_STAFF, DEFAULT_SHIFTS,
+                            ShiftCalendar)
+from storage import DEFAULT_ROSTER, ScheduleDatabase
 
 
 class EmployeeScheduler:
     
-    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    SHIFTS = ["Morning", "Afternoon", "Evening"]
-    MAX_DAYS_PER_WEEK = 5
-    MIN_EMPLOYEES_PER_SHIFT = 2
+    DAYS = DEFAULT_DAYS
+    SHIFTS = DEFAULT_SHIFTS
+    MAX_DAYS_PER_WEEK = DEFAULT_MAX_DAYS
+    MIN_EMPLOYEES_PER_SHIFT = DEFAULT_MIN_STAFF
+    SOLVERS = ("greedy", "flow")
     
-    def __init__(self):
+    def __init__(self, sink: EventSink = None, seed: int = None,
+                 calendar: ShiftCalendar = None):
+        self.calendar = calendar or ShiftCalendar(self.DAYS, self.SHIFTS, self.MAX_DAYS_PER_WEEK,
+                                                  self.MIN_EMPLOYEES_PER_SHIFT)
+        # The class constants are only the default calendar; each instance
+        # shadows them with its own so existing callers keep working.
+        self.DAYS = self.calendar.days
+        self.SHIFTS = self.calendar.shifts
+        self.MAX_DAYS_PER_WEEK = self.calendar.max_days
+        self.MIN_EMPLOYEES_PER_SHIFT = self.calendar.min_staff
+        self.sink = sink if sink is not None else PrintSink()
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.metrics = PhaseTimer()
+        self.metrics_weeks = 1
         self.employees = []
+        self.employee_ids: Dict[str, int] = {}
+        self.employee_names: Dict[int, str] = {}
+        self._next_employee_id = 0
         self.preferences = defaultdict(lambda: defaultdict(list))
-        self.schedule = {day: {shift: [] for shift in self.SHIFTS} for day in self.DAYS}
-        self.days_worked = defaultdict(int)
-        self.employee_assigned_days = defaultdict(set)
-    
-    def add_employee(self, name: str):
-        if name not in self.employees:
-            self.employees.append(name)
-            print(f"Added employee: {name}")
-        else:
-            print(f"Employee {name} already exists.")
+        self.store = AssignmentStore(self.DAYS, self.SHIFTS, self.MAX_DAYS_PER_WEEK)
+        self.solved = False
+        self._availability = None
+        self._carryover = None
+        self.horizon: List[dict] = []
+        self.horizon_days_worked: Dict[str, int] = {}
     
-    def add_preference(self, employee: str, day: str, shifts: List[str]):
-        if employee not in self.employees:
-            print(f"Error: Employee {employee} not found. Add them first.")
-            return
+    @property
+    def schedule(self) -> Dict[str, Dict[str, List[str]]]:
+        return self.store.as_schedule()
+    
+    @property
+    def days_worked(self) -> Dict[str, int]:
+        return self.store.days_worked
+    
+    @property
+    def assigned_shift(self) -> Dict[str, Dict[str, str]]:
+        return self.store.assigned_shift
+    
+    def _register_employee(self, name: str) -> int:
+        emp_id = self._next_employee_id
+        self._next_employee_id += 1
+        self.employee_ids[name] = emp_id
+        self.employee_names[emp_id] = name
+        self.employees.append(name)
+        return emp_id
+    
+    def has_employee(self, name: str) -> bool:
+        return name in self.employee_ids
+    
+    def get_employee_id(self, name: str) -> int:
+        return self.employee_ids[name]
+    
+    def add_employee(self, name: str) -> int:
+        if name not in self.employee_ids:
+            emp_id = self._register_employee(name)
+            self.sink.emit("employee_added", employee=name)
+            if self.solved:
+                self._availability_index().touch(name)
+                self._repair_days(self.DAYS)
+            return emp_id
+        self.sink.emit("employee_exists", employee=name)
+        return self.employee_ids[name]
+    
+    def add_employees(self, names: Iterable[str]) -> List[int]:
+        verbose = self.sink.enabled
+        ids = []
+        for name in names:
+            emp_id = self.employee_ids.get(name)
+            if emp_id is None:
+                emp_id = self._register_employee(name)
+                if verbose:
+                    self.sink.emit("employee_added", employee=name)
+                if self.solved:
+                    self._availability_index().touch(name)
+            ids.append(emp_id)
+        if self.solved:
+            self._repair_days(self.DAYS)
+        return ids
+    
+    def _validate_preference(self, employee: str, day: str, shifts: List[str]):
+        if employee not in self.employee_ids:
+            self.sink.emit("error", message=f"Employee {employee} not found. Add them first.")
+            return None
         
         if day not in self.DAYS:
-            print(f"Error: Invalid day {day}")
-            return
+            self.sink.emit("error", message=f"Invalid day {day}")
+            return None
         
         valid_shifts = [s for s in shifts if s in self.SHIFTS]
         if not valid_shifts:
-            print(f"Error: No valid shifts provided")
+            self.sink.emit("error", message="No valid shifts provided")
+            return None
+        
+        return valid_shifts
+    
+    def add_preference(self, employee: str, day: str, shifts: List[str]):
+        valid_shifts = self._validate_preference(employee, day, shifts)
+        if valid_shifts is None:
             return
         
         self.preferences[employee][day] = valid_shifts
-        print(f"Added preference for {employee} on {day}: {', '.join(valid_shifts)}")
+        self.sink.emit("preference_added", employee=employee, day=day, shifts=valid_shifts)
     
-    def assign_shifts(self):
-        print("\n" + "="*60)
-        print("STARTING SHIFT ASSIGNMENT")
-        print("="*60)
+    def add_preferences(self, records: Iterable[Tuple[str, str, List[str]]]) -> int:
+        employee_ids = self.employee_ids
+        preferences = self.preferences
+        valid_days = set(self.DAYS)
+        valid_shift_names = set(self.SHIFTS)
+        added = 0
+        for employee, day, shifts in records:
+            if employee in employee_ids and day in valid_days:
+                valid_shifts = [s for s in shifts if s in valid_shift_names]
+                if valid_shifts:
+                    preferences[employee][day] = valid_shifts
+                    added += 1
+                    continue
+            # Re-run the full check only for rejected rows to report why.
+            self._validate_preference(employee, day, shifts)
+        return added
+    
+    def _check_solver(self, solver: str):
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {', '.join(self.SOLVERS)}")
+    
+    def assign_shifts(self, solver: str = "greedy"):
+        self._check_solver(solver)
+        self._start_metrics(weeks=1)
+        self.sink.emit("assignment_started")
+        self._assign_week(solver)
+        self.sink.emit("assignment_completed")
+    
+    def assign_horizon(self, weeks: int, solver: str = "greedy") -> List[dict]:
+        self._check_solver(solver)
+        if weeks < 1:
+            raise ValueError("weeks must be at least 1")
+        
+        self._start_metrics(weeks)
+        self.sink.emit("assignment_started")
+        carryover = defaultdict(int)
+        self.horizon = []
         
-        self.schedule = {day: {shift: [] for shift in self.SHIFTS} for day in self.DAYS}
-        self.days_worked = defaultdict(int)
-        self.employee_assigned_days = defaultdict(set)
+        for week in range(1, weeks + 1):
+            self.sink.emit("week_started", week=week)
+            self._assign_week(solver, carryover)
+            self.horizon.append({
+                'schedule': self.schedule,
+                'days_worked': dict(self.days_worked),
+            })
+            for employee, days in self.days_worked.items():
+                carryover[employee] += days
+        
+        self.horizon_days_worked = dict(carryover)
+        self.sink.emit("assignment_completed")
+        return self.horizon
+    
+    def _start_metrics(self, weeks: int):
+        # Metrics describe the latest solve. Load and parse figures recorded
+        # before the first solve are kept; a re-solve starts from zero.
+        if self.solved:
+            self.metrics.reset()
+        self.metrics_weeks = weeks
+    
+    def _reset_week(self, carryover: Dict[str, int] = None):
+        # Each week gets a fresh assignment store; the roster, preferences and
+        # ID index are shared across every week of a horizon.
+        self.store = AssignmentStore(self.DAYS, self.SHIFTS, self.MAX_DAYS_PER_WEEK)
+        self._availability = None
+        self._carryover = carryover
+    
+    def _assign_week(self, solver: str, carryover: Dict[str, int] = None):
+        self._reset_week(carryover)
+        metrics = self.metrics
+        if solver == "flow":
+            with metrics.phase("flow_solve"):
+                self._assign_min_cost_flow(carryover)
+        else:
+            with metrics.phase("greedy_assignment"):
+                self._assign_preferences_greedy()
+            with metrics.phase("fill"):
+                self._fill_understaffed()
+        self.solved = True
+    
+    def _availability_index(self) -> AvailabilityIndex:
+        if self._availability is None:
+            self._availability = AvailabilityIndex(self.employees, self.store,
+                                                   self._carryover, self.rng)
+        return self._availability
+    
+    def preference_records(self) -> List[Tuple[str, str, List[str]]]:
+        return [
+            (employee, day, list(shifts))
+            for employee in self.employees
+            for day, shifts in self.preferences.get(employee, {}).items()
+        ]
+    
+    def assignments(self) -> List[Tuple[str, str, str]]:
+        return list(self.store.assignments())
+    
+    def load_assignments(self, assignments: Iterable[Tuple[str, str, str]]) -> int:
+        self._reset_week()
+        placed = sum(1 for employee, day, shift in assignments
+                     if self.store.place(employee, day, shift))
+        self.solved = True
+        return placed
+    
+    def save(self, database: ScheduleDatabase, roster: str = DEFAULT_ROSTER,
+             label: str = None, solver: str = None) -> Optional[int]:
+        database.save_roster(self.employees, self.preference_records(), roster)
+        if not self.solved:
+            return None
+        return database.save_schedule(self.store.assignments(), roster, label, solver,
+                                      self.calendar.to_dict(), self._compute_statistics())
+    
+    def load(self, database: ScheduleDatabase, roster: str = DEFAULT_ROSTER,
+             version: int = None) -> int:
+        with self.metrics.phase("load"):
+            employees, records = database.load_roster(roster)
+            self.add_employees(employees)
+            self.add_preferences(records)
+            self.metrics.count("rows_read", len(records))
+            if version is not None:
+                self.load_assignments(database.load_schedule(version))
+        return len(employees)
+    
+    def _place(self, employee: str, day: str, shift: str) -> bool:
+        return self.store.place(employee, day, shift)
+    
+    def _unplace(self, employee: str, day: str):
+        shift = self.store.unplace(employee, day)
+        if shift is None:
+            return None
+        if self._availability is not None:
+            self._availability.touch(employee)
+        if self.sink.enabled:
+            self.sink.emit("unassigned", employee=employee, day=day, shift=shift)
+        return shift
+    
+    def _assign_preferences_greedy(self):
+        sink = self.sink
+        verbose = sink.enabled
+        store = self.store
+        placed = 0
         
         for employee in self.employees:
+            preferences = self.preferences[employee]
             for day in self.DAYS:
-                if day in self.preferences[employee]:
-                    if self.days_worked[employee] >= self.MAX_DAYS_PER_WEEK:
-                        continue
-                    
-                    if day in self.employee_assigned_days[employee]:
-                        continue
-                    
-                    assigned = False
-                    for shift in self.preferences[employee][day]:
-                        self.schedule[day][shift].append(employee)
-                        self.days_worked[employee] += 1
-                        self.employee_assigned_days[employee].add(day)
-                        print(f"Assigned {employee} to {day} - {shift}")
-                        assigned = True
+                shifts = preferences.get(day)
+                if shifts is None:
+                    continue
+                
+                # place() turns down a second shift on the day or a day past
+                # the weekly cap, so only the first preference is tried.
+                if not shifts:
+                    if verbose:
+                        sink.emit("not_assigned", employee=employee, day=day)
+                elif store.place(employee, day, shifts[0]):
+                    placed += 1
+                    if verbose:
+                        sink.emit("assigned", employee=employee, day=day, shift=shifts[0])
+        
+        self.metrics.count("assignments", placed)
+    
+    def _fill_understaffed(self):
+        sink = self.sink
+        verbose = sink.enabled
+        sink.emit("fill_started")
+        
+        availability = self._availability_index()
+        scanned_before = availability.scanned
+        total_filled = 0
+        
+        for day, shift, required in self.calendar.slots():
+            current_count = self.store.count(day, shift)
+            
+            if current_count < required:
+                needed = required - current_count
+                if verbose:
+                    sink.emit("understaffed", day=day, shift=shift, needed=needed)
+                
+                filled = 0
+                while filled < needed:
+                    emp = availability.pop_least_loaded(day)
+                    if emp is None:
                         break
-                    
-                    if not assigned:
-                        print(f"Could not assign {employee} to {day}")
+                    self._place(emp, day, shift)
+                    filled += 1
+                    if verbose:
+                        sink.emit("fill_assigned", employee=emp, day=day, shift=shift)
+                
+                total_filled += filled
+                if filled == 0:
+                    sink.emit("no_available", day=day, shift=shift)
         
-        print("\n" + "-"*60)
-        print("FILLING UNDERSTAFFED SHIFTS")
-        print("-"*60)
+        self.metrics.count("assignments", total_filled)
+        self.metrics.count("fill_assignments", total_filled)
+        self.metrics.count("candidates_scanned", availability.scanned - scanned_before)
+    
+    def _assign_min_cost_flow(self, carryover: Dict[str, int] = None):
+        sink = self.sink
+        verbose = sink.enabled
         
-        for day in self.DAYS:
+        assignments = solve_week(self.employees, self.preferences, self.DAYS, self.SHIFTS,
+                                 self.MAX_DAYS_PER_WEEK, self.calendar.demand,
+                                 fill_penalty=carryover)
+        for employee, day, shift, preferred in assignments:
+            self._place(employee, day, shift)
+            if verbose:
+                sink.emit("assigned" if preferred else "fill_assigned",
+                          employee=employee, day=day, shift=shift)
+        self.metrics.count("assignments", len(assignments))
+        self.metrics.count("fill_assignments", sum(1 for *_, preferred in assignments if not preferred))
+        
+        for day, shift, required in self.calendar.slots():
+            needed = required - self.store.count(day, shift)
+            if needed > 0:
+                sink.emit("understaffed", day=day, shift=shift, needed=needed)
+                sink.emit("no_available", day=day, shift=shift)
+    
+    def _repair_days(self, days: Iterable[str], exclude: str = None):
+        # Tops up understaffed slots on the given days only; existing
+        # assignments are left alone so the rest of the schedule is stable.
+        sink = self.sink
+        verbose = sink.enabled
+        availability = self._availability_index()
+        
+        for day in days:
+            held = []
             for shift in self.SHIFTS:
-                current_count = len(self.schedule[day][shift])
-                
-                if current_count < self.MIN_EMPLOYEES_PER_SHIFT:
-                    needed = self.MIN_EMPLOYEES_PER_SHIFT - current_count
-                    print(f"\n{day} - {shift} needs {needed} more employee(s)")
-                    
-                    available = []
-                    for emp in self.employees:
-                        if (self.days_worked[emp] < self.MAX_DAYS_PER_WEEK and 
-                            day not in self.employee_assigned_days[emp]):
-                            available.append(emp)
-                    
-                    if available:
-                        random.shuffle(available)
-                        for i in range(min(needed, len(available))):
-                            emp = available[i]
-                            self.schedule[day][shift].append(emp)
-                            self.days_worked[emp] += 1
-                            self.employee_assigned_days[emp].add(day)
-                            print(f"  Randomly assigned {emp} to {day} - {shift}")
-                    else:
-                        print(f"  WARNING: No available employees for {day} - {shift}")
+                needed = self.calendar.required(day, shift) - self.store.count(day, shift)
+                while needed > 0:
+                    emp = availability.pop_least_loaded(day)
+                    if emp is None:
+                        sink.emit("no_available", day=day, shift=shift)
+                        break
+                    if emp == exclude:
+                        held.append(emp)
+                        continue
+                    self._place(emp, day, shift)
+                    needed -= 1
+                    if verbose:
+                        sink.emit("fill_assigned", employee=emp, day=day, shift=shift)
+            for emp in held:
+                availability.touch(emp)
+    
+    def update_preference(self, employee: str, day: str, shifts: List[str]) -> bool:
+        if employee not in self.employee_ids:
+            self.sink.emit("error", message=f"Employee {employee} not found. Add them first.")
+            return False
+        if day not in self.DAYS:
+            self.sink.emit("error", message=f"Invalid day {day}")
+            return False
         
-        print("\n" + "="*60)
-        print("SHIFT ASSIGNMENT COMPLETE")
-        print("="*60 + "\n")
+        valid_shifts = [s for s in shifts if s in self.SHIFTS]
+        if shifts and not valid_shifts:
+            self.sink.emit("error", message="No valid shifts provided")
+            return False
+        
+        if valid_shifts:
+            self.preferences[employee][day] = valid_shifts
+        else:
+            self.preferences[employee].pop(day, None)
+        self.sink.emit("preference_updated", employee=employee, day=day, shifts=valid_shifts or ["none"])
+        
+        if not self.solved:
+            return True
+        
+        self._unplace(employee, day)
+        if valid_shifts and self._place(employee, day, valid_shifts[0]):
+            self.sink.emit("assigned", employee=employee, day=day, shift=valid_shifts[0])
+        self._repair_days([day], exclude=employee)
+        return True
     
-    def resolve_conflicts(self):
-        print("\n" + "="*60)
-        print("RESOLVING CONFLICTS")
-        print("="*60)
+    def remove_employee(self, name: str) -> bool:
+        if name not in self.employee_ids:
+            self.sink.emit("error", message=f"Employee {name} not found.")
+            return False
         
-        conflicts_found = False
+        affected_days = list(self.assigned_shift.get(name, ()))
+        for day in affected_days:
+            self._unplace(name, day)
+        self.store.remove_employee(name)
         
+        emp_id = self.employee_ids.pop(name)
+        del self.employee_names[emp_id]
+        self.employees.remove(name)
+        self.preferences.pop(name, None)
+        if self._availability is not None:
+            self._availability.discard(name)
+        self.sink.emit("employee_removed", employee=name)
+        
+        if self.solved:
+            self._repair_days(affected_days)
+        return True
+    
+    def resolve_conflicts(self):
+        with self.metrics.phase("conflict_resolution"):
+            self._resolve_conflicts()
+    
+    def _resolve_conflicts(self):
+        # The assignment store rejects a second shift on the same day when it
+        # is placed, so this is a verification pass: it only finds entries
+        # that were written around the store, and drops them.
+        sink = self.sink
+        sink.emit("conflicts_started")
+        
+        problems = self.store.verify()
         for day in self.DAYS:
-            employees_today = []
-            for shift in self.SHIFTS:
-                employees_today.extend(self.schedule[day][shift])
-            
-            seen = set()
-            duplicates = set()
-            for emp in employees_today:
-                if emp in seen:
-                    duplicates.add(emp)
-                seen.add(emp)
-            
-            if duplicates:
-                conflicts_found = True
-                print(f"CONFLICT on {day}: {', '.join(duplicates)} assigned to multiple shifts")
-                
-                for emp in duplicates:
-                    kept_shift = None
-                    for shift in self.SHIFTS:
-                        if emp in self.schedule[day][shift]:
-                            if kept_shift is None:
-                                kept_shift = shift
-                                print(f"  Keeping {emp} in {shift}")
-                            else:
-                                self.schedule[day][shift].remove(emp)
-                                self.days_worked[emp] -= 1
-                                print(f"  Removed {emp} from {shift}")
-        
-        if not conflicts_found:
-            print("No conflicts detected.")
+            on_day = [(emp, shift) for emp, problem_day, shift in problems if problem_day == day]
+            if not on_day:
+                continue
+            sink.emit("conflict", day=day, employees=sorted({emp for emp, _ in on_day}))
+            for emp, shift in on_day:
+                self.store.discard(emp, day, shift)
+                sink.emit("conflict_removed", employee=emp, shift=shift)
         
-        print("="*60 + "\n")
+        self.metrics.count("conflicts_removed", len(problems))
+        if not problems:
+            sink.emit("no_conflicts")
+        
+        sink.emit("conflicts_completed")
     
-    def display_schedule(self):
-        print("\n" + "="*60)
-        print("FINAL WEEKLY SCHEDULE")
-        print("="*60 + "\n")
+    def display_schedule(self, file: TextIO = None):
+        out = file or sys.stdout
+        print("\n" + "="*60, file=out)
+        print("FINAL WEEKLY SCHEDULE", file=out)
+        print("="*60 + "\n", file=out)
         
+        schedule = self.schedule
         for day in self.DAYS:
-            print("="*60)
-            print(day.upper())
-            print("="*60)
+            print("="*60, file=out)
+            print(day.upper(), file=out)
+            print("="*60, file=out)
             
             for shift in self.SHIFTS:
-                employees = self.schedule[day][shift]
+                employees = schedule[day][shift]
                 emp_count = len(employees)
+                required = self.calendar.required(day, shift)
                 
                 if employees:
                     emp_list = ", ".join(employees)
-                    status = "✓" if emp_count >= self.MIN_EMPLOYEES_PER_SHIFT else f"⚠ (needs {self.MIN_EMPLOYEES_PER_SHIFT - emp_count} more)"
-                    print(f"  {shift:12} ({emp_count} employees) {status}")
-                    print(f"               → {emp_list}")
+                    status = "✓" if emp_count >= required else f"⚠ (needs {required - emp_count} more)"
+                    print(f"  {shift:12} ({emp_count} employees) {status}", file=out)
+                    print(f"               → {emp_list}", file=out)
                 else:
-                    print(f"  {shift:12} (0 employees) ⚠ UNDERSTAFFED")
+                    print(f"  {shift:12} (0 employees) ⚠ UNDERSTAFFED", file=out)
             
-            print()
+            print(file=out)
         
-        print("="*60)
-        print("EMPLOYEE WORK SUMMARY")
-        print("="*60)
+        print("="*60, file=out)
+        print("EMPLOYEE WORK SUMMARY", file=out)
+        print("="*60, file=out)
         
         for emp in sorted(self.employees):
             days = self.days_worked[emp]
             status = "✓" if days <= self.MAX_DAYS_PER_WEEK else "⚠ OVER LIMIT"
-            print(f"  {emp:20} {days} days {status}")
+            print(f"  {emp:20} {days} days {status}", file=out)
         
-        print("="*60 + "\n")
+        print("="*60 + "\n", file=out)
+    
+    def compute_statistics(self) -> Dict[str, float]:
+        with self.metrics.phase("statistics"):
+            stats = self._compute_statistics()
+        stats.update(self.metrics.as_dict())
+        return stats
+    
+    def _compute_statistics(self) -> Dict[str, float]:
+        # One pass over the slots, using the store's running counts; building
+        # a ScheduleMatrix here would cost O(employees * slots) per call.
+        total_shifts = 0
+        filled_shifts = 0
+        understaffed_shifts = 0
+        
+        for day, shift, required in self.calendar.slots():
+            total_shifts += 1
+            emp_count = self.store.count(day, shift)
+            if emp_count > 0:
+                filled_shifts += 1
+            if emp_count < required:
+                understaffed_shifts += 1
+        
+        total_days_assigned = self.store.size
+        return {
+            'total_shifts': total_shifts,
+            'filled_shifts': filled_shifts,
+            'understaffed_shifts': understaffed_shifts,
+            'total_employees': len(self.employees),
+            'average_days': total_days_assigned / len(self.employees) if self.employees else 0,
+        }
     
     def get_statistics(self):
+        stats = self.compute_statistics()
+        
         print("\n" + "="*60)
         print("SCHEDULING STATISTICS")
         print("="*60)
         
-        total_shifts = 0
-        filled_shifts = 0
-        understaffed_shifts = 0
+        print(f"Total shifts: {stats['total_shifts']}")
+        print(f"Filled shifts: {stats['filled_shifts']}")
+        print(f"Understaffed shifts: {stats['understaffed_shifts']}")
+        print(f"Total employees: {stats['total_employees']}")
+        print(f"Average days per employee: {stats['average_days']:.2f}")
         
-        for day in self.DAYS:
-            for shift in self.SHIFTS:
-                total_shifts += 1
-                emp_count = len(self.schedule[day][shift])
-                if emp_count > 0:
-                    filled_shifts += 1
-                if emp_count < self.MIN_EMPLOYEES_PER_SHIFT:
-                    understaffed_shifts += 1
-        
-        print(f"Total shifts: {total_shifts}")
-        print(f"Filled shifts: {filled_shifts}")
-        print(f"Understaffed shifts: {understaffed_shifts}")
-        print(f"Total employees: {len(self.employees)}")
-        
-        total_days_assigned = sum(self.days_worked.values())
-        avg_days = total_days_assigned / len(self.employees) if self.employees else 0
-        print(f"Average days per employee: {avg_days:.2f}")
+        if self.metrics_weeks > 1:
+            print(f"Timings and counters below are totals over {self.metrics_weeks} weeks.")
+        if stats['timings']:
+            print("Phase timings:")
+            for phase, seconds in stats['timings'].items():
+                print(f"  {phase:20} {seconds * 1000:9.3f} ms")
+        for name, value in stats['counters'].items():
+            print(f"{name.replace('_', ' ').capitalize()}: {value}")
         
         print("="*60 + "\n")
+        return stats
@@ -0,0 +1,104 @@
+import json
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+DEFAULT_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DEFAULT_SHIFTS = ["Morning", "Afternoon", "Evening"]
+DEFAULT_MAX_DAYS = 5
+DEFAULT_MIN_STAFF = 2
+
+
+def _intern(names: Sequence[str], kind: str) -> Dict[str, int]:
+    index = {}
+    for name in names:
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"Invalid {kind} name {name!r}")
+        if name in index:
+            raise ValueError(f"Duplicate {kind} '{name}'")
+        index[name] = len(index)
+    if not index:
+        raise ValueError(f"A calendar needs at least one {kind}")
+    return index
+
+
+# Days and shifts are interned to dense integers when the calendar is built.
+# A slot's id is day index * len(shifts) + shift index, and its demand is read
+# from a flat list, so per-slot lookups stay O(1) however many slots there are.
+class ShiftCalendar:
+    
+    def __init__(self, days: Sequence[str] = DEFAULT_DAYS, shifts: Sequence[str] = DEFAULT_SHIFTS,
+                 max_days: int = DEFAULT_MAX_DAYS, min_staff: int = DEFAULT_MIN_STAFF,
+                 demand: Mapping[str, Mapping[str, int]] = None):
+        self.day_index = _intern(days, "day")
+        self.shift_index = _intern(shifts, "shift")
+        self.days: List[str] = list(self.day_index)
+        self.shifts: List[str] = list(self.shift_index)
+        self.max_days = int(max_days)
+        self.min_staff = int(min_staff)
+        if not 0 < self.max_days <= len(self.days):
+            raise ValueError(f"max_days must be between 1 and {len(self.days)}")
+        if self.min_staff < 0:
+            raise ValueError("min_staff cannot be negative")
+        
+        width = len(self.shifts)
+        self.demand: List[int] = [self.min_staff] * (len(self.days) * width)
+        for day, shifts in (demand or {}).items():
+            if day not in self.day_index:
+                raise ValueError(f"Demand given for unknown day '{day}'")
+            for shift, required in shifts.items():
+                if shift not in self.shift_index:
+                    raise ValueError(f"Demand given for unknown shift '{shift}'")
+                if int(required) < 0:
+                    raise ValueError(f"Demand for {day} {shift} cannot be negative")
+                self.demand[self.day_index[day] * width + self.shift_index[shift]] = int(required)
+    
+    @property
+    def num_slots(self) -> int:
+        return len(self.demand)
+    
+    def slot_id(self, day: str, shift: str) -> int:
+        return self.day_index[day] * len(self.shifts) + self.shift_index[shift]
+    
+    def required(self, day: str, shift: str) -> int:
+        return self.demand[self.slot_id(day, shift)]
+    
+    def slots(self) -> Iterator[Tuple[str, str, int]]:
+        demand = iter(self.demand)
+        for day in self.days:
+            for shift in self.shifts:
+                yield day, shift, next(demand)
+    
+    def demand_table(self) -> List[List[int]]:
+        width = len(self.shifts)
+        return [self.demand[d * width:(d + 1) * width] for d in range(len(self.days))]
+    
+    def to_dict(self) -> dict:
+        return {
+            'days': self.days,
+            'shifts': self.shifts,
+            'maxDays': self.max_days,
+            'minStaff': self.min_staff,
+            'demand': {day: dict(zip(self.shifts, row))
+                       for day, row in zip(self.days, self.demand_table())},
+        }
+    
+    @classmethod
+    def from_dict(cls, config: Mapping) -> "ShiftCalendar":
+        return cls(config.get('days', DEFAULT_DAYS), config.get('shifts', DEFAULT_SHIFTS),
+                   config.get('maxDays', DEFAULT_MAX_DAYS), config.get('minStaff', DEFAULT_MIN_STAFF),
+                   config.get('demand'))
+    
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ShiftCalendar) and self.days == other.days
+                and self.shifts == other.shifts and self.max_days == other.max_days
+                and self.demand == other.demand)
+    
+    def __hash__(self):
+        return hash((tuple(self.days), tuple(self.shifts), self.max_days, tuple(self.demand)))
+
+
+def load_calendar(path: str) -> ShiftCalendar:
+    with open(path, 'r') as file:
+        return ShiftCalendar.from_dict(json.load(file))
+
+
+DEFAULT_CALENDAR = ShiftCalendar()
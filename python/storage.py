@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_ROSTER = "default"
+
+PreferenceRecord = Tuple[str, str, List[str]]
+Assignment = Tuple[str, str, str]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    roster TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (roster, name)
+);
+CREATE TABLE IF NOT EXISTS preferences (
+    employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    shift TEXT NOT NULL,
+    PRIMARY KEY (employee_id, day, rank)
+);
+CREATE TABLE IF NOT EXISTS schedule_versions (
+    id INTEGER PRIMARY KEY,
+    roster TEXT NOT NULL,
+    label TEXT,
+    solver TEXT,
+    created_at REAL NOT NULL,
+    calendar TEXT,
+    statistics TEXT
+);
+CREATE INDEX IF NOT EXISTS schedule_versions_roster ON schedule_versions (roster, id);
+CREATE TABLE IF NOT EXISTS assignments (
+    version_id INTEGER NOT NULL REFERENCES schedule_versions(id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    shift TEXT NOT NULL,
+    employee TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (version_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assignments_employee ON assignments (employee, version_id);
+"""
+
+
+# Rosters and published weeks live in one SQLite file. WAL mode lets readers
+# (another process, or a report run) keep querying while a week is written;
+# within a process one connection is shared behind a lock, since SQLite
+# serializes writers anyway. Every bulk write is a single executemany().
+class ScheduleDatabase:
+    
+    def __init__(self, path: str):
+        # sqlite3 is only loaded once a database is opened, so importing this
+        # module for DEFAULT_ROSTER costs next to nothing.
+        import sqlite3
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    def save_roster(self, employees: Iterable[str], records: Iterable[PreferenceRecord],
+                    roster: str = DEFAULT_ROSTER) -> int:
+        # Replaces the roster's employees and preferences wholesale; it is
+        # one transaction, so readers see either the old roster or the new.
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM employees WHERE roster = ?", (roster,))
+            conn.executemany("INSERT OR IGNORE INTO employees (roster, name) VALUES (?, ?)",
+                             ((roster, name) for name in employees))
+            ids = dict(conn.execute("SELECT name, id FROM employees WHERE roster = ?", (roster,)))
+            conn.executemany(
+                "INSERT OR REPLACE INTO preferences (employee_id, day, rank, shift) VALUES (?, ?, ?, ?)",
+                ((ids[employee], day, rank, shift)
+                 for employee, day, shifts in records if employee in ids
+                 for rank, shift in enumerate(shifts))
+            )
+            return len(ids)
+    
+    def load_roster(self, roster: str = DEFAULT_ROSTER) -> Tuple[List[str], List[PreferenceRecord]]:
+        names = dict(self._query("SELECT id, name FROM employees WHERE roster = ? ORDER BY id", (roster,)))
+        rows = self._query(
+            "SELECT p.employee_id, p.day, p.shift FROM preferences p JOIN employees e ON e.id = p.employee_id "
+            "WHERE e.roster = ? ORDER BY p.employee_id, p.rowid", (roster,))
+        # A day's shifts were inserted together, in rank order, so they come
+        # back as one contiguous run.
+        records = [(names[employee_id], day, [row[2] for row in group])
+                   for (employee_id, day), group in groupby(rows, itemgetter(0, 1))]
+        return list(names.values()), records
+    
+    def rosters(self) -> List[str]:
+        return [name for name, in self._query("SELECT DISTINCT roster FROM employees ORDER BY roster")]
+    
+    def save_schedule(self, assignments: Iterable[Assignment], roster: str = DEFAULT_ROSTER,
+                      label: str = None, solver: str = None, calendar: dict = None,
+                      statistics: dict = None) -> int:
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO schedule_versions (roster, label, solver, created_at, calendar, statistics) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (roster, label, solver, time.time(),
+                 json.dumps(calendar) if calendar is not None else None,
+                 json.dumps(statistics) if statistics is not None else None)
+            )
+            version = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO assignments (version_id, day, shift, employee, position) VALUES (?, ?, ?, ?, ?)",
+                ((version, day, shift, employee, position)
+                 for position, (employee, day, shift) in enumerate(assignments))
+            )
+            return version
+    
+    def load_schedule(self, version: int) -> List[Assignment]:
+        return self._query(
+            "SELECT employee, day, shift FROM assignments WHERE version_id = ? ORDER BY position",
+            (version,))
+    
+    def latest_version(self, roster: str = DEFAULT_ROSTER) -> Optional[int]:
+        row = self._query("SELECT MAX(id) FROM schedule_versions WHERE roster = ?", (roster,))
+        return row[0][0]
+    
+    def versions(self, roster: str = DEFAULT_ROSTER, limit: int = 50) -> List[dict]:
+        rows = self._query(
+            "SELECT id, label, solver, created_at, statistics FROM schedule_versions "
+            "WHERE roster = ? ORDER BY id DESC LIMIT ?", (roster, limit))
+        return [
+            {'id': version, 'label': label, 'solver': solver, 'createdAt': created_at,
+             'statistics': json.loads(statistics) if statistics else None}
+            for version, label, solver, created_at, statistics in rows
+        ]
+    
+    def employee_history(self, employee: str, roster: str = DEFAULT_ROSTER) -> Iterator[tuple]:
+        # (version, label, day, shift) for every published week, newest first.
+        return iter(self._query(
+            "SELECT v.id, v.label, a.day, a.shift FROM assignments a "
+            "JOIN schedule_versions v ON v.id = a.version_id "
+            "WHERE a.employee = ? AND v.roster = ? ORDER BY v.id DESC, a.position",
+            (employee, roster)))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
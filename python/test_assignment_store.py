@@ -0,0 +1,43 @@
+import unittest
+from assignment_store import AssignmentStore
+
+
+class AssignmentStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = AssignmentStore(["Mon", "Tue", "Wed"], ["Morning", "Evening"], max_days=2)
+    
+    def test_rejects_second_shift_on_a_day(self):
+        self.assertTrue(self.store.place("A", "Mon", "Morning"))
+        self.assertFalse(self.store.place("A", "Mon", "Evening"))
+        self.assertEqual(self.store.slot("Mon", "Evening"), [])
+        self.assertEqual(self.store.shift_of("A", "Mon"), "Morning")
+        self.assertEqual(self.store.size, 1)
+    
+    def test_rejects_days_past_the_cap(self):
+        self.assertTrue(self.store.place("A", "Mon", "Morning"))
+        self.assertTrue(self.store.place("A", "Tue", "Morning"))
+        self.assertFalse(self.store.can_place("A", "Wed"))
+        self.assertFalse(self.store.place("A", "Wed", "Morning"))
+        self.assertEqual(self.store.days_worked["A"], 2)
+    
+    def test_unplace_frees_the_day(self):
+        self.store.place("A", "Mon", "Morning")
+        self.store.place("A", "Tue", "Morning")
+        self.assertEqual(self.store.unplace("A", "Mon"), "Morning")
+        self.assertIsNone(self.store.unplace("A", "Mon"))
+        self.assertTrue(self.store.place("A", "Wed", "Evening"))
+        self.assertEqual(self.store.verify(), [])
+    
+    def test_move_keeps_the_day_count(self):
+        self.store.place("A", "Mon", "Morning")
+        self.store.move("A", "Mon", "Tue", "Evening")
+        self.assertEqual(self.store.slot("Mon", "Morning"), [])
+        self.assertEqual(self.store.slot("Tue", "Evening"), ["A"])
+        self.assertTrue(self.store.works("A", "Tue"))
+        self.assertFalse(self.store.works("A", "Mon"))
+        self.assertEqual(self.store.days_worked["A"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
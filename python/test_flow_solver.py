@@ -0,0 +1,114 @@
+import random
+import unittest
+from flow_solver import INF, MinCostFlow, solve_week
+
+
+def reference_min_cost(n_nodes, edges, source, sink):
+    # Plain successive shortest paths: Bellman-Ford over the residual graph,
+    # one unit at a time, while the cheapest path has negative cost.
+    to, cap, cost, adj = [], [], [], [[] for _ in range(n_nodes)]
+    for u, v, c, w in edges:
+        adj[u].append(len(to))
+        adj[v].append(len(to) + 1)
+        to += [v, u]
+        cap += [c, 0]
+        cost += [w, -w]
+    total_flow = total_cost = 0
+    while True:
+        dist = [INF] * n_nodes
+        prev = [-1] * n_nodes
+        dist[source] = 0
+        for _ in range(n_nodes - 1):
+            changed = False
+            for u in range(n_nodes):
+                if dist[u] == INF:
+                    continue
+                for edge in adj[u]:
+                    if cap[edge] > 0 and dist[u] + cost[edge] < dist[to[edge]]:
+                        dist[to[edge]] = dist[u] + cost[edge]
+                        prev[to[edge]] = edge
+                        changed = True
+            if not changed:
+                break
+        if dist[sink] == INF or dist[sink] >= 0:
+            return total_flow, total_cost
+        v = sink
+        while v != source:
+            edge = prev[v]
+            cap[edge] -= 1
+            cap[edge ^ 1] += 1
+            v = to[edge ^ 1]
+        total_flow += 1
+        total_cost += dist[sink]
+
+
+def random_layered_graph(rng, layers, width):
+    # Nodes are numbered layer by layer and every edge points to a later
+    # layer (sometimes skipping some), as MinCostFlow's initial potentials
+    # require. Mixed-sign costs give paths that later flow must undo.
+    nodes = [[0]]
+    next_node = 1
+    for _ in range(layers):
+        nodes.append(list(range(next_node, next_node + rng.randint(1, width))))
+        next_node = nodes[-1][-1] + 1
+    nodes.append([next_node])
+    edges = []
+    for i, here in enumerate(nodes):
+        for j in range(i + 1, len(nodes)):
+            chance = 0.6 if j == i + 1 else 0.15
+            for u in here:
+                for v in nodes[j]:
+                    if rng.random() < chance:
+                        edges.append((u, v, rng.randint(1, 4), rng.randint(-25, 15)))
+    return next_node + 1, edges, next_node
+
+
+class MinCostFlowTest(unittest.TestCase):
+    
+    def test_matches_bellman_ford_reference(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            n_nodes, edges, sink = random_layered_graph(rng, rng.randint(1, 6), 5)
+            graph = MinCostFlow(n_nodes)
+            for edge in edges:
+                graph.add_edge(*edge)
+            self.assertEqual(graph.solve(0, sink)[1], reference_min_cost(n_nodes, edges, 0, sink)[1])
+    
+    def test_flow_respects_capacities_and_conservation(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            n_nodes, edges, sink = random_layered_graph(rng, 4, 5)
+            graph = MinCostFlow(n_nodes)
+            ids = [graph.add_edge(*edge) for edge in edges]
+            total, _ = graph.solve(0, sink)
+            balance = [0] * n_nodes
+            for edge_id, (u, v, cap, _) in zip(ids, edges):
+                flow = graph.flow(edge_id)
+                self.assertTrue(0 <= flow <= cap)
+                balance[u] -= flow
+                balance[v] += flow
+            self.assertEqual(balance[sink], total)
+            self.assertEqual(balance[0], -total)
+            self.assertFalse(any(balance[1:sink]))
+
+
+class SolveWeekTest(unittest.TestCase):
+    
+    def test_covers_demand_before_preferences(self):
+        # Everyone prefers Morning, but Evening still needs one person a day.
+        employees = ["A", "B", "C"]
+        preferences = {e: {"Mon": ["Morning"], "Tue": ["Morning"]} for e in employees}
+        result = solve_week(employees, preferences, ["Mon", "Tue"], ["Morning", "Evening"], 2, 1)
+        for day in ("Mon", "Tue"):
+            shifts = [shift for _, d, shift, _ in result if d == day]
+            self.assertEqual(shifts.count("Evening"), 1)
+            self.assertEqual(shifts.count("Morning"), 2)
+    
+    def test_never_exceeds_max_days(self):
+        preferences = {"A": {day: ["Day"] for day in "1234567"}}
+        result = solve_week(["A"], preferences, list("1234567"), ["Day"], 3, 0)
+        self.assertEqual(len(result), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from events import NULL_SINK
+from scheduler import EmployeeScheduler
+from shift_calendar import ShiftCalendar
+
+
+def two_day_scheduler() -> EmployeeScheduler:
+    # One shift a day needing two people; A and B prefer both days, C has no
+    # preferences and is only used to fill.
+    scheduler = EmployeeScheduler(sink=NULL_SINK, seed=1,
+                                  calendar=ShiftCalendar(["Mon", "Tue"], ["Day"], 2, 2))
+    scheduler.add_employees(["A", "B", "C"])
+    scheduler.add_preferences([(employee, day, ["Day"]) for employee in "AB" for day in ("Mon", "Tue")])
+    scheduler.assign_shifts()
+    return scheduler
+
+
+class IncrementalRepairTest(unittest.TestCase):
+    
+    def test_remove_employee_refills_their_days(self):
+        scheduler = two_day_scheduler()
+        self.assertEqual(scheduler.store.slot("Mon", "Day"), ["A", "B"])
+        
+        self.assertTrue(scheduler.remove_employee("A"))
+        for day in ("Mon", "Tue"):
+            self.assertEqual(sorted(scheduler.store.slot(day, "Day")), ["B", "C"])
+        self.assertNotIn("A", scheduler.days_worked)
+        self.assertEqual(scheduler.store.verify(), [])
+    
+    def test_update_preference_repairs_the_day(self):
+        scheduler = two_day_scheduler()
+        self.assertTrue(scheduler.update_preference("A", "Mon", []))
+        self.assertEqual(sorted(scheduler.store.slot("Mon", "Day")), ["B", "C"])
+        self.assertEqual(scheduler.store.slot("Tue", "Day"), ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,70 +1,424 @@
 #!/usr/bin/env python3
 
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import os
 import json
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Tuple
 from scheduler import EmployeeScheduler
+from events import NULL_SINK
+from profiling import PROFILERS, PhaseTimer, capture_profile
+from result_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, ResultCache, canonical_key
+from shift_calendar import DEFAULT_CALENDAR, ShiftCalendar, load_calendar
+from schedule_diff import diff_assignments, schedule_assignments
+from storage import DEFAULT_ROSTER, ScheduleDatabase
 
+HOST = ""
 PORT = 8888
+WORKERS = min(32, (os.cpu_count() or 1) + 4)
+PENDING_PER_WORKER = 4
+COMPACT_TYPE = "application/vnd.scheduler.compact+json"
+# Bodies smaller than this go out uncompressed; gzip would barely help.
+GZIP_MIN_BYTES = 1024
 
-class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
+
+class PooledHTTPServer(http.server.HTTPServer):
+    
+    def __init__(self, server_address, handler_class, workers: int = WORKERS,
+                 max_pending: int = None):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler-worker")
+        # Bounds queued connections; when full, accept() stops and the OS
+        # listen backlog applies back-pressure instead of an unbounded queue.
+        self._pending = threading.BoundedSemaphore(max_pending or workers * PENDING_PER_WORKER)
+    
+    def process_request(self, request, client_address):
+        self._pending.acquire()
+        try:
+            self.pool.submit(self._process_request, request, client_address)
+        except RuntimeError:
+            self._pending.release()
+            self.shutdown_request(request)
+    
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._pending.release()
+    
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+# Encoded once: the identity and gzip bodies, a content hash for ETag and the
+# page source's mtime for Last-Modified. Cache-Control: no-cache lets browsers
+# keep the page but revalidate it, which is answered with a bodiless 304.
+class StaticAsset:
+    
+    def __init__(self, body: bytes, content_type: str, last_modified: float):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.last_modified = email.utils.formatdate(int(last_modified), usegmt=True)
+        self.modified_at = int(last_modified)
+    
+    def not_modified(self, headers) -> bool:
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or any(tag.removeprefix('W/') == self.etag for tag in tags)
+        if_modified_since = headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.modified_at <= since
+        return False
+
+
+def _accepts(header: str, names) -> bool:
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        if name.strip().lower() in names:
+            q = params.strip()
+            if not q.startswith('q='):
+                return True
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def accepts_gzip(headers) -> bool:
+    return _accepts(headers.get('Accept-Encoding', ''), ('gzip', '*'))
+
+
+def accepts_compact(headers) -> bool:
+    return _accepts(headers.get('Accept', ''), (COMPACT_TYPE,))
+
+
+# A response body plus its gzip form, compressed on first use so a cached
+# result is compressed at most once however often it is served.
+class EncodedBody:
+    
+    __slots__ = ('body', '_gzip')
+    
+    def __init__(self, body: bytes):
+        self.body = body
+        self._gzip = None
+    
+    def gzipped(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzip
+
+
+def compact_schedule(scheduler: EmployeeScheduler) -> dict:
+    # Names are sent once; each slot is a list of indices into 'employees',
+    # and slots are listed day-major in calendar order.
+    index = {name: i for i, name in enumerate(scheduler.employees)}
+    store = scheduler.store
+    return {
+        'format': 'compact',
+        'version': 1,
+        'employees': scheduler.employees,
+        'days': scheduler.DAYS,
+        'shifts': scheduler.SHIFTS,
+        'slots': [[index[name] for name in store.slots[day][shift]]
+                  for day in scheduler.DAYS for shift in scheduler.SHIFTS],
+        'daysWorked': [store.days_worked.get(name, 0) for name in scheduler.employees],
+    }
+
+
+def compact_assignments(document: dict) -> Iterable[Tuple[str, str, str]]:
+    # The inverse of compact_schedule: slot k is day k // len(shifts) and
+    # shift k % len(shifts).
+    employees, days, shifts, slots = (document['employees'], document['days'],
+                                      document['shifts'], document['slots'])
+    if len(slots) != len(days) * len(shifts):
+        raise ValueError("Compact schedule needs one slot per day and shift")
+    count, width = len(employees), len(shifts)
+    assignments = []
+    for k, members in enumerate(slots):
+        if not isinstance(members, list) or not all(
+                type(i) is int and 0 <= i < count for i in members):
+            raise ValueError("Compact slots must be lists of employee indices")
+        day, shift = days[k // width], shifts[k % width]
+        assignments.extend((employees[i], day, shift) for i in members)
+    return assignments
+
+
+class SchedulerHandler(http.server.BaseHTTPRequestHandler):
+    
+    result_cache = ResultCache()
+    calendar = DEFAULT_CALENDAR
+    database: ScheduleDatabase = None
+    index_page: StaticAsset = None
     
     def do_GET(self):
+        self.handle_get(send_body=True)
+    
+    def do_HEAD(self):
+        self.handle_get(send_body=False)
+    
+    def handle_get(self, send_body: bool):
         try:
-            if self.path == '/' or self.path == '/index.html':
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html; charset=utf-8')
-                self.end_headers()
-                html_content = self.get_html()
-                self.wfile.write(html_content.encode('utf-8'))
+            path = urllib.parse.urlsplit(self.path).path
+            if path == '/' or path == '/index.html':
+                self.send_asset(self.index_page, send_body)
+            elif path == '/stats':
+                self.send_json({'cache': self.result_cache.stats()}, send_body)
+            elif path == '/calendar':
+                self.send_json(self.calendar.to_dict(), send_body)
+            elif path.startswith('/schedules') and self.database is not None:
+                self.send_history(path, send_body)
             else:
-                super().do_GET()
+                # Only the routes above are served; nothing falls through to
+                # the working directory.
+                self.send_error(404)
         except Exception as e:
             print(f"Error in do_GET: {e}")
             import traceback
             traceback.print_exc()
     
+    def send_history(self, path: str, send_body: bool):
+        # /schedules?roster=<name> lists published weeks, newest first;
+        # /schedules/<id> returns one of them as (employee, day, shift) rows.
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        roster = query.get('roster', [DEFAULT_ROSTER])[0]
+        version = path[len('/schedules'):].strip('/')
+        if not version:
+            self.send_json({'roster': roster, 'versions': self.database.versions(roster)}, send_body)
+        elif version.isdigit():
+            rows = self.database.load_schedule(int(version))
+            if not rows:
+                self.send_error(404)
+                return
+            self.send_json({'version': int(version), 'assignments': rows}, send_body)
+        else:
+            self.send_error(404)
+    
+    def send_asset(self, asset: StaticAsset, send_body: bool = True):
+        if asset.not_modified(self.headers):
+            self.send_response(304)
+            self.send_header('ETag', asset.etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+        
+        body = asset.body
+        compressed = accepts_gzip(self.headers)
+        if compressed:
+            body = asset.gzip_body
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', asset.etag)
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
     def do_POST(self):
         if self.path == '/generate':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode())
+            metrics = PhaseTimer()
+            try:
+                with metrics.phase("parse"):
+                    content_length = int(self.headers['Content-Length'])
+                    post_data = self.rfile.read(content_length)
+                    data = json.loads(post_data.decode())
+                    solver = data.get('solver', 'greedy')
+                    seed = data.get('seed')
+                    want_metrics = bool(data.get('metrics', False))
+                    profilers = data.get('profile') or []
+                    if isinstance(profilers, str):
+                        profilers = [profilers]
+                    profilers = [str(name) for name in profilers]
+                    publish = data.get('publish')
+                    if publish is not None:
+                        publish = str(publish)
+                    roster = [
+                        (emp_data['name'], {pref['day']: pref['shifts'] for pref in emp_data['preferences']})
+                        for emp_data in data['employees']
+                    ]
+            except (TypeError, ValueError, KeyError, AttributeError):
+                self.send_error(400, "Invalid request body")
+                return
             
-            import sys
-            import io
-            old_stdout = sys.stdout
-            sys.stdout = io.StringIO()
+            if solver not in EmployeeScheduler.SOLVERS:
+                self.send_error(400, f"Unknown solver '{solver}'")
+                return
+            calendar = self.calendar
+            if data.get('calendar') is not None:
+                try:
+                    calendar = ShiftCalendar.from_dict(data['calendar'])
+                except (TypeError, ValueError, AttributeError) as e:
+                    self.send_error(400, f"Invalid calendar: {e}")
+                    return
+            if publish and self.database is None:
+                self.send_error(400, "Publishing needs the server to run with --db")
+                return
+            unknown = [name for name in profilers if name not in PROFILERS]
+            if unknown:
+                self.send_error(400, f"Unknown profiler '{unknown[0]}'")
+                return
             
-            try:
-                scheduler = EmployeeScheduler()
-                
-                for emp_data in data['employees']:
-                    name = emp_data['name']
-                    scheduler.add_employee(name)
-                    
-                    for pref in emp_data['preferences']:
-                        day = pref['day']
-                        shifts = pref['shifts']
-                        scheduler.add_preference(name, day, shifts)
-                
-                scheduler.assign_shifts()
-                scheduler.resolve_conflicts()
-                
-                response = {
-                    'schedule': dict(scheduler.schedule),
-                    'daysWorked': dict(scheduler.days_worked),
-                    'employees': scheduler.employees
-                }
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
-            finally:
-                sys.stdout = old_stdout
+            # Metrics and profiles describe this particular run, and a
+            # published week must be solved to be stored, so those requests
+            # always solve and never touch the result cache.
+            instrumented = want_metrics or profilers or publish
+            compact = accepts_compact(self.headers)
+            key = canonical_key(roster, solver, seed, calendar.to_dict(), compact)
+            encoded = None if instrumented else self.result_cache.get(key)
+            cache_status = 'BYPASS' if instrumented else 'HIT'
+            if encoded is None:
+                if not instrumented:
+                    cache_status = 'MISS'
+                try:
+                    with capture_profile(profilers) as profile:
+                        body = self.solve(roster, solver, metrics, seed, calendar, compact, publish)
+                except (TypeError, ValueError):
+                    self.send_error(400, "Invalid employee data")
+                    return
+                if instrumented:
+                    extra = {}
+                    if want_metrics:
+                        extra['metrics'] = metrics.as_dict()
+                    if profile:
+                        extra['profile'] = profile
+                    # Splice the extra keys into the serialized object rather
+                    # than decoding and re-encoding the schedule.
+                    if extra:
+                        body = body[:-1] + b", " + json.dumps(extra).encode()[1:]
+                encoded = EncodedBody(body)
+                if not instrumented:
+                    self.result_cache.put(key, encoded)
+            
+            self.send_encoded(encoded, compact, {'X-Cache': cache_status,
+                                                 'Server-Timing': metrics.server_timing()})
+        elif self.path == '/diff':
+            self.handle_diff()
+        else:
+            self.send_error(404)
+    
+    def send_encoded(self, encoded: EncodedBody, compact: bool, headers: dict = None):
+        body = encoded.body
+        compressed = len(body) >= GZIP_MIN_BYTES and accepts_gzip(self.headers)
+        if compressed:
+            body = encoded.gzipped()
+        self.send_response(200)
+        self.send_header('Content-type', COMPACT_TYPE if compact else 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept, Accept-Encoding')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
     
-    def get_html(self):
+    def diff_side(self, side) -> Iterable[Tuple[str, str, str]]:
+        # A published version number (with --db), a /generate response in
+        # either format, or a bare {day: {shift: [employees]}} schedule.
+        if isinstance(side, int) and not isinstance(side, bool):
+            if self.database is None:
+                raise ValueError("Version numbers need the server to run with --db")
+            rows = self.database.load_schedule(side)
+            if not rows:
+                raise ValueError(f"Unknown schedule version {side}")
+            return rows
+        if isinstance(side, dict) and side.get('format') == 'compact':
+            return compact_assignments(side)
+        if isinstance(side, dict) and isinstance(side.get('schedule'), dict):
+            side = side['schedule']
+        if not isinstance(side, dict):
+            raise ValueError("Expected a schedule or a version number")
+        return list(schedule_assignments(side))
+    
+    def handle_diff(self):
+        metrics = PhaseTimer()
+        try:
+            with metrics.phase("parse"):
+                content_length = int(self.headers['Content-Length'])
+                data = json.loads(self.rfile.read(content_length).decode())
+                old = self.diff_side(data['old'])
+                new = self.diff_side(data['new'])
+            with metrics.phase("diff"):
+                diff = diff_assignments(old, new)
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            self.send_error(400, f"Invalid diff request: {e}")
+            return
+        
+        compact = accepts_compact(self.headers)
+        with metrics.phase("serialize"):
+            if compact:
+                body = json.dumps(diff.as_compact(), separators=(',', ':')).encode()
+            else:
+                body = json.dumps(diff.as_dict()).encode()
+        self.send_encoded(EncodedBody(body), compact, {'Server-Timing': metrics.server_timing()})
+    
+    def solve(self, roster, solver: str, metrics: PhaseTimer = None, seed: int = None,
+              calendar: ShiftCalendar = None, compact: bool = False, publish: str = None) -> bytes:
+        # Everything here is request-local: each request gets its own
+        # scheduler and a no-op sink, so worker threads share no state.
+        scheduler = EmployeeScheduler(sink=NULL_SINK, seed=seed, calendar=calendar)
+        if metrics is not None:
+            scheduler.metrics = metrics
+        scheduler.add_employees(name for name, _ in roster)
+        scheduler.add_preferences(
+            (name, day, shifts)
+            for name, preferences in roster
+            for day, shifts in preferences.items()
+        )
+        
+        scheduler.assign_shifts(solver)
+        scheduler.resolve_conflicts()
+        version = scheduler.save(self.database, publish, solver=solver) if publish else None
+        
+        with scheduler.metrics.phase("serialize"):
+            if compact:
+                response = compact_schedule(scheduler)
+                if version is not None:
+                    response['version'] = version
+                return json.dumps(response, separators=(',', ':')).encode()
+            response = {
+                'schedule': dict(scheduler.schedule),
+                'daysWorked': dict(scheduler.days_worked),
+                'employees': scheduler.employees
+            }
+            if version is not None:
+                response['version'] = version
+            return json.dumps(response).encode()
+    
+    def send_json(self, payload, send_body: bool = True):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    @staticmethod
+    def get_html() -> str:
         return """<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -381,10 +735,33 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
     </div>
     
     <script>
-        const DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'];
-        const SHIFTS = ['Morning', 'Afternoon', 'Evening'];
+        // Replaced by the server's calendar (GET /calendar) once it loads.
+        let DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'];
+        let SHIFTS = ['Morning', 'Afternoon', 'Evening'];
+        let MAX_DAYS = 5;
+        let MIN_STAFF = 2;
+        let DEMAND = {};
         let employees = [];
         
+        async function loadCalendar() {
+            try {
+                const response = await fetch('/calendar');
+                const calendar = await response.json();
+                DAYS = calendar.days;
+                SHIFTS = calendar.shifts;
+                MAX_DAYS = calendar.maxDays;
+                MIN_STAFF = calendar.minStaff;
+                DEMAND = calendar.demand;
+                renderEmployees();
+            } catch (error) {
+                console.warn('Using the default calendar: ' + error);
+            }
+        }
+        
+        function required(day, shift) {
+            return (DEMAND[day] && DEMAND[day][shift] !== undefined) ? DEMAND[day][shift] : MIN_STAFF;
+        }
+        
         function addEmployee() {
             const nameInput = document.getElementById('employeeName');
             const name = nameInput.value.trim();
@@ -480,12 +857,15 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
             try {
                 const response = await fetch('/generate', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'Accept': 'application/vnd.scheduler.compact+json, application/json;q=0.9'
+                    },
                     body: JSON.stringify({ employees: employees })
                 });
                 
                 const data = await response.json();
-                displaySchedule(data);
+                displaySchedule(decodeSchedule(data));
             } catch (error) {
                 alert('Error generating schedule: ' + error);
             } finally {
@@ -493,6 +873,23 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
             }
         }
         
+        function decodeSchedule(data) {
+            if (data.format !== 'compact') {
+                return data;
+            }
+            const schedule = {};
+            let slot = 0;
+            data.days.forEach(day => {
+                schedule[day] = {};
+                data.shifts.forEach(shift => {
+                    schedule[day][shift] = data.slots[slot++].map(i => data.employees[i]);
+                });
+            });
+            const daysWorked = {};
+            data.employees.forEach((emp, i) => { daysWorked[emp] = data.daysWorked[i]; });
+            return { schedule: schedule, daysWorked: daysWorked, employees: data.employees };
+        }
+        
         function displaySchedule(data) {
             const output = document.getElementById('scheduleOutput');
             
@@ -505,7 +902,7 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
                 SHIFTS.forEach(shift => {
                     const emps = data.schedule[day][shift];
                     const empList = emps.length > 0 ? emps.join(', ') : '<em>No one assigned</em>';
-                    const status = emps.length >= 2 ? '✓' : '⚠️';
+                    const status = emps.length >= required(day, shift) ? '✓' : '⚠️';
                     
                     html += `<div class="schedule-shift">
                         <div class="shift-title">${status} ${shift} (${emps.length} employees)</div>
@@ -519,7 +916,7 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
             html += '<div class="summary"><h3> Summary</h3>';
             data.employees.forEach(emp => {
                 const days = data.daysWorked[emp];
-                const status = days <= 5 ? '✓' : '⚠️';
+                const status = days <= MAX_DAYS ? '✓' : '⚠️';
                 html += `<div class="summary-item">${status} ${emp}: ${days} days</div>`;
             });
             html += '</div>';
@@ -536,17 +933,46 @@ class SchedulerHandler(http.server.SimpleHTTPRequestHandler):
                 document.getElementById('scheduleOutput').classList.remove('show');
             }
         }
+        
+        loadCalendar();
     </script>
 </body>
 </html>
 """
 
-def main():
-    with socketserver.TCPServer(("", PORT), SchedulerHandler) as httpd:
+
+SchedulerHandler.index_page = StaticAsset(SchedulerHandler.get_html().encode('utf-8'),
+                                          'text/html; charset=utf-8', os.path.getmtime(__file__))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Employee Scheduler Web UI")
+    parser.add_argument('--host', default=HOST, help="interface to bind (default: all)")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="maximum concurrent requests")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help="cached /generate results (0 disables the cache)")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL_SECONDS,
+                        help="seconds a cached result stays valid")
+    parser.add_argument('--calendar', help="JSON calendar with days, shifts and per-slot demand")
+    parser.add_argument('--db', help="SQLite file to publish schedules to (enables /schedules)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    SchedulerHandler.result_cache = ResultCache(args.cache_size, args.cache_ttl)
+    if args.calendar:
+        SchedulerHandler.calendar = load_calendar(args.calendar)
+    if args.db:
+        SchedulerHandler.database = ScheduleDatabase(args.db)
+    with PooledHTTPServer((args.host, args.port), SchedulerHandler, workers=args.workers) as httpd:
         print("=" * 70)
         print("Employee Scheduler Web UI")
         print("=" * 70)
-        print(f"\n Server running at: http://localhost:{PORT}")
+        print(f"\n Server running at: http://{args.host or 'localhost'}:{args.port}")
+        print(f" Worker threads: {args.workers}")
         print("\n Instructions:")
         print("  1. Open the URL above in your web browser")
         print("  2. Add employees and set their preferences")